@@ -1,35 +1,83 @@
 """The EnergyMe integration."""
 
+import asyncio
 import logging
 import re
-from datetime import timedelta
+from typing import TYPE_CHECKING
 
-import requests
-from requests.auth import HTTPDigestAuth
-from http import HTTPStatus
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     DOMAIN,
+    ATTR_CONFIG_ENTRY_ID,
+    SERVICE_REFRESH_CHANNEL_CONFIG,
     CONF_HOST,
     CONF_USERNAME,
     CONF_PASSWORD,
-    DEFAULT_SCAN_INTERVAL,
-    CONF_SCAN_INTERVAL,
-    SYSTEM_SCAN_INTERVAL,
+    CONF_CONNECT_TIMEOUT,
+    CONF_METER_READ_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_METER_READ_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
 )
 
+# The HTTP client, coordinators and cache are imported when an entry is set
+# up (in the executor, see async_import_runtime_modules): importing the
+# package, which the config flow does on every discovery, stays cheap
+if TYPE_CHECKING:
+    from .api import EnergyMeClient
+    from .coordinator import EnergyMeMeterCoordinator
+
+# The coordinator module imports the client (api) and the fleet poller
+RUNTIME_MODULES = ("coordinator", "cache")
+
 _LOGGER = logging.getLogger(__name__)
 
 # Define the platforms that this integration will support
 PLATFORMS = ["sensor"]
 
-TIMEOUT_REQUESTS = 10
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+REFRESH_CHANNEL_CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the EnergyMe services."""
+
+    async def async_handle_refresh_channel_config(call: ServiceCall) -> None:
+        """Re-fetch the channel configuration of one or all EnergyMe devices."""
+        loaded_entries = hass.data.get(DOMAIN, {})
+        entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID) or list(loaded_entries)
+
+        for entry_id in entry_ids:
+            coordinators = loaded_entries.get(entry_id)
+            if coordinators is None:
+                raise ServiceValidationError(
+                    f"EnergyMe config entry {entry_id} is not loaded"
+                )
+            meter_coordinator: EnergyMeMeterCoordinator = coordinators["meter_coordinator"]
+            await meter_coordinator.async_refresh_channel_config()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_CHANNEL_CONFIG,
+        async_handle_refresh_channel_config,
+        schema=REFRESH_CHANNEL_CONFIG_SCHEMA,
+    )
+    return True
+
 
 async def async_migrate_entity_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Migrate entity IDs to lowercase format for HA 2026.2+ compatibility.
@@ -83,18 +131,43 @@ async def async_migrate_entity_ids(hass: HomeAssistant, entry: ConfigEntry) -> N
             )
 
 
+async def async_import_runtime_modules(hass: HomeAssistant) -> None:
+    """Import the modules used by a loaded entry without blocking the event loop."""
+    for module in RUNTIME_MODULES:
+        await async_import_module(hass, f"{__name__}.{module}")
+
+
+def apply_client_options(client: "EnergyMeClient", entry: ConfigEntry) -> None:
+    """Apply the request timeouts of the config entry options to the client."""
+    from .api import RequestPriority
+
+    read_timeout = entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    client.set_timeouts(
+        entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        {
+            RequestPriority.METER: entry.options.get(
+                CONF_METER_READ_TIMEOUT, DEFAULT_METER_READ_TIMEOUT
+            ),
+            RequestPriority.CONFIG: read_timeout,
+            RequestPriority.SYSTEM: read_timeout,
+        },
+    )
+
+
 async def async_update_options_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
     coordinators = hass.data[DOMAIN][entry.entry_id]
-    meter_coordinator: DataUpdateCoordinator = coordinators["meter_coordinator"]
-    new_scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    meter_coordinator: EnergyMeMeterCoordinator = coordinators["meter_coordinator"]
     _LOGGER.debug(
-        "Updating scan interval for %s to %s seconds",
+        "Updating polling options for %s: %s",
         entry.title,
-        new_scan_interval,
+        dict(entry.options),
     )
+    apply_client_options(coordinators["client"], entry)
+
     # Only update the meter coordinator interval (system coordinator stays at fixed interval)
-    meter_coordinator.update_interval = timedelta(seconds=new_scan_interval)
+    meter_coordinator.apply_options(entry.options)
+    meter_coordinator.async_update_streaming()
 
     # Request a refresh with the new interval
     await meter_coordinator.async_request_refresh()
@@ -102,6 +175,21 @@ async def async_update_options_listener(hass: HomeAssistant, entry: ConfigEntry)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up EnergyMe from a config entry."""
+    await async_import_runtime_modules(hass)
+    from .api import (
+        CircuitBreaker,
+        EnergyMeClient,
+        async_create_device_session,
+        async_get_scheduler,
+    )
+    from .cache import EnergyMeCache
+    from .coordinator import (
+        EnergyMeMeterCoordinator,
+        EnergyMeSystemCoordinator,
+        entry_device_id,
+    )
+    from .fleet import async_get_fleet_poller
+
     # Migrate entity IDs to lowercase for HA 2026.2+ compatibility
     await async_migrate_entity_ids(hass, entry)
 
@@ -109,156 +197,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
 
-    # Get scan interval from options, fallback to default
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
-    # Create digest auth object
-    auth = HTTPDigestAuth(username, password)
-
-    # Create separate coordinators for meter and system data
-    async def async_update_meter_data():
-        """Fetch meter data from API endpoint."""
-        try:
-            # Fetch channel configuration using new API endpoint
-            channel_config_url = f"http://{host}/api/v1/ade7953/channel"
-
-            def get_channel_config():
-                return requests.get(
-                    channel_config_url,
-                    auth=auth,
-                    timeout=TIMEOUT_REQUESTS,
-                    headers={"accept": "application/json"}
-                )
-
-            raw_channel_config = await hass.async_add_executor_job(get_channel_config)
-            raw_channel_config.raise_for_status()
-            channel_config = raw_channel_config.json()
-
-            # Fetch meter data using new API endpoint
-            meter_data_url = f"http://{host}/api/v1/ade7953/meter-values"
-
-            def get_meter_data():
-                return requests.get(
-                    meter_data_url,
-                    auth=auth,
-                    timeout=TIMEOUT_REQUESTS,
-                    headers={"accept": "application/json"}
-                )
-
-            raw_meter_data = await hass.async_add_executor_job(get_meter_data)
-            raw_meter_data.raise_for_status()
-            meter_data = raw_meter_data.json()
-
-            return {"channels": channel_config, "meter": meter_data}
-
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == HTTPStatus.UNAUTHORIZED.value:
-                _LOGGER.error("Authentication failed for EnergyMe device at %s", host)
-                raise ConfigEntryAuthFailed(
-                    f"Authentication failed for EnergyMe device at {host}"
-                ) from err
-            _LOGGER.error("HTTP error from EnergyMe device: %s", err)
-            raise UpdateFailed(f"HTTP error from EnergyMe device: {err}") from err
-        except requests.exceptions.Timeout:
-            _LOGGER.error("Timeout connecting to EnergyMe device at %s", host)
-            raise UpdateFailed(f"Timeout connecting to EnergyMe device at {host}")
-        except requests.exceptions.ConnectionError:
-            _LOGGER.error("Error connecting to EnergyMe device at %s", host)
-            raise UpdateFailed(f"Error connecting to EnergyMe device at {host}")
-        except Exception as err:
-            _LOGGER.exception("Unexpected error fetching EnergyMe meter data")
-            raise UpdateFailed(f"Unexpected error: {err}")
-
-    async def async_update_system_data():
-        """Fetch system data from API endpoint."""
-        try:
-            # Fetch device info for system sensors
-            device_info_url = f"http://{host}/api/v1/system/info"
-
-            def get_device_info():
-                return requests.get(
-                    device_info_url,
-                    auth=auth,
-                    timeout=TIMEOUT_REQUESTS,
-                    headers={"accept": "application/json"}
-                )
-
-            raw_device_info = await hass.async_add_executor_job(get_device_info)
-            raw_device_info.raise_for_status()
-            device_info = raw_device_info.json()
-
-            # Fetch update info (non-critical, handle errors gracefully)
-            update_info = {}
-            try:
-                update_info_url = f"http://{host}/api/v1/firmware/update-info"
-
-                def get_update_info():
-                    return requests.get(
-                        update_info_url,
-                        auth=auth,
-                        timeout=TIMEOUT_REQUESTS,
-                        headers={"accept": "application/json"}
-                    )
-
-                raw_update_info = await hass.async_add_executor_job(get_update_info)
-                raw_update_info.raise_for_status()
-                update_info = raw_update_info.json()
-            except Exception as err:
-                _LOGGER.warning(
-                    "Failed to fetch update info from EnergyMe device at %s: %s. "
-                    "Update sensors will be unavailable.",
-                    host,
-                    err
-                )
-
-            # Combine the data
-            return {"device_info": device_info, "update_info": update_info}
-
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == HTTPStatus.UNAUTHORIZED.value:
-                _LOGGER.error("Authentication failed for EnergyMe device at %s for system data", host)
-                raise ConfigEntryAuthFailed(
-                    f"Authentication failed for EnergyMe device at {host}"
-                ) from err
-            _LOGGER.error("HTTP error from EnergyMe device for system data: %s", err)
-            raise UpdateFailed(f"HTTP error from EnergyMe device: {err}") from err
-        except requests.exceptions.Timeout:
-            _LOGGER.error("Timeout connecting to EnergyMe device at %s for system data", host)
-            raise UpdateFailed(f"Timeout connecting to EnergyMe device at {host}")
-        except requests.exceptions.ConnectionError:
-            _LOGGER.error("Error connecting to EnergyMe device at %s for system data", host)
-            raise UpdateFailed(f"Error connecting to EnergyMe device at {host}")
-        except Exception as err:
-            _LOGGER.exception("Unexpected error fetching EnergyMe system data")
-            raise UpdateFailed(f"Unexpected error: {err}")
-
-    # Create meter data coordinator (configurable interval)
-    meter_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_meter_coordinator_{host}",
-        update_method=async_update_meter_data,
-        update_interval=timedelta(seconds=scan_interval),
+    # All coordinators of this device share one client (and keep-alive connection),
+    # and every client of the host shares one request scheduler. The circuit
+    # breaker suspends the coordinators' requests while the device is offline.
+    client = EnergyMeClient(
+        async_create_device_session(hass),
+        host,
+        username,
+        password,
+        scheduler=async_get_scheduler(hass, host),
+        circuit_breaker=CircuitBreaker(),
     )
+    apply_client_options(client, entry)
 
-    # Create system data coordinator (fixed interval)
-    system_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_system_coordinator_{host}",
-        update_method=async_update_system_data,
-        update_interval=timedelta(seconds=SYSTEM_SCAN_INTERVAL),  # Fixed interval
+    # Create separate coordinators for meter and system data. The meter polls
+    # of every device are staggered and bounded by the shared fleet poller.
+    meter_coordinator = EnergyMeMeterCoordinator(
+        hass, entry, client, fleet=async_get_fleet_poller(hass)
+    )
+    system_coordinator = EnergyMeSystemCoordinator(hass, entry, client)
+
+    # Start from the last known data of the device, if any: the entities are
+    # created at once and both coordinators refresh in the background.
+    # Otherwise only the meter data is needed to create the entities (the
+    # active channels); the system data is fetched alongside it and the system
+    # sensors are populated when it arrives. On legacy entries, whose unique ID
+    # is the host, the main device is identified by the device ID of the
+    # system data, which is then awaited too. If an awaited fetch fails, it
+    # raises ConfigEntryNotReady and setup will retry.
+    cache = EnergyMeCache(hass, entry)
+    cached = await cache.async_load()
+    restored = bool(
+        cached and cached.get("channel_config") and cached.get("meter_values") is not None
+    )
+    if restored:
+        _LOGGER.debug("Restoring the last known data of %s", entry.title)
+        meter_coordinator.async_restore(cached["channel_config"], cached["meter_values"])
+        system_coordinator.async_restore(
+            cached.get("device_info", {}), cached.get("update_info", {})
+        )
+    device_id_known = entry_device_id(entry) is not None or bool(
+        system_coordinator.data and system_coordinator.data["values"].get("device_id")
     )
 
-    # Fetch initial data so we have it when entities are set up.
-    # If the fetch fails, it will raise ConfigEntryNotReady and setup will retry.
-    await meter_coordinator.async_config_entry_first_refresh()
-    await system_coordinator.async_config_entry_first_refresh()
+    awaited = []
+    if not restored:
+        awaited.append(meter_coordinator)
+    if not device_id_known:
+        awaited.append(system_coordinator)
+    for coordinator in (meter_coordinator, system_coordinator):
+        if coordinator not in awaited:
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{coordinator.name}_first_refresh"
+            )
+    await asyncio.gather(
+        *(coordinator.async_config_entry_first_refresh() for coordinator in awaited)
+    )
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
+        "client": client,
         "meter_coordinator": meter_coordinator,
         "system_coordinator": system_coordinator,
+        "cache": cache,
         "config_entry": entry,
     }
 
@@ -266,6 +267,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Using new method for HA 2022.11+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Keep the last known data for the next startup
+    cache.async_track(meter_coordinator, system_coordinator)
+
+    # Follow the meter values stream, if enabled (polling is the fallback)
+    meter_coordinator.async_update_streaming()
+
     # Add listener for options flow updates
     entry.async_on_unload(entry.add_update_listener(async_update_options_listener))
 
@@ -276,6 +283,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinators = hass.data[DOMAIN].pop(entry.entry_id)
+        # The coordinators no longer update it: write what is pending now
+        await coordinators["cache"].async_flush()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cached data of a removed config entry."""
+    await async_import_runtime_modules(hass)
+    from .cache import async_remove_cache
+
+    await async_remove_cache(hass, entry.entry_id)
@@ -0,0 +1,836 @@
+"""Async HTTP client for the EnergyMe device API."""
+
+import asyncio
+import bisect
+import hashlib
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from enum import IntEnum, StrEnum
+from http import HTTPStatus
+from typing import Any
+from urllib.request import parse_http_list, parse_keqv_list
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    CIRCUIT_BACKOFF_MAX,
+    CIRCUIT_BACKOFF_MIN,
+    CIRCUIT_FAILURE_THRESHOLD,
+    DOMAIN,
+    ENDPOINT_CHANNEL,
+    ENDPOINT_HEALTH,
+    ENDPOINT_METER_VALUES,
+    ENDPOINT_METER_VALUES_STREAM,
+    ENDPOINT_SYSTEM_INFO,
+    ENDPOINT_UPDATE_INFO,
+    MAX_IN_FLIGHT_REQUESTS,
+    STREAM_READ_TIMEOUT,
+    LATENCY_BUCKETS_MS,
+    TIMEOUT_HEALTH_PROBE,
+    TIMEOUT_REQUESTS,
+)
+from .decode import build_schema, json_loads, project
+from .system import SYSTEM_INFO_FIELDS, UPDATE_INFO_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEDULERS = f"{DOMAIN}_schedulers"
+
+# Projections of the payloads the coordinators keep
+SYSTEM_INFO_SCHEMA = build_schema(SYSTEM_INFO_FIELDS)
+UPDATE_INFO_SCHEMA = build_schema(UPDATE_INFO_FIELDS)
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request to the device, lower is served first."""
+
+    METER = 0
+    CONFIG = 1
+    SYSTEM = 2
+
+
+ENDPOINT_PRIORITIES: dict[str, RequestPriority] = {
+    ENDPOINT_HEALTH: RequestPriority.METER,
+    ENDPOINT_METER_VALUES: RequestPriority.METER,
+    ENDPOINT_CHANNEL: RequestPriority.CONFIG,
+    ENDPOINT_SYSTEM_INFO: RequestPriority.SYSTEM,
+    ENDPOINT_UPDATE_INFO: RequestPriority.SYSTEM,
+}
+
+
+class EnergyMeError(Exception):
+    """Base error raised by the EnergyMe client."""
+
+
+class EnergyMeConnectionError(EnergyMeError):
+    """Error raised when the device cannot be reached."""
+
+
+class EnergyMeTimeoutError(EnergyMeConnectionError):
+    """Error raised when the device does not answer in time."""
+
+
+class EnergyMeCircuitOpenError(EnergyMeConnectionError):
+    """Error raised while requests to an unreachable device are suspended."""
+
+
+class EnergyMeAuthError(EnergyMeError):
+    """Error raised when the device rejects the credentials."""
+
+
+class EnergyMeResponseError(EnergyMeError):
+    """Error raised when the device answers with an unexpected response."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error with the HTTP status, if any."""
+        super().__init__(message)
+        self.status = status
+
+
+class RequestTiming:
+    """Connection timing of one HTTP round trip, filled in by the trace hooks."""
+
+    __slots__ = ("connect", "connect_start")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.connect_start: float | None = None
+        self.connect: float | None = None
+
+
+async def _async_on_connection_create_start(
+    session: aiohttp.ClientSession, context: Any, params: Any
+) -> None:
+    """Note when a new connection to the device is opened."""
+    if isinstance(context.trace_request_ctx, RequestTiming):
+        context.trace_request_ctx.connect_start = time.monotonic()
+
+
+async def _async_on_connection_create_end(
+    session: aiohttp.ClientSession, context: Any, params: Any
+) -> None:
+    """Note how long opening the connection took."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, RequestTiming) and timing.connect_start is not None:
+        timing.connect = time.monotonic() - timing.connect_start
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Return the trace hooks measuring the TCP connect time of requests."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_async_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_async_on_connection_create_end)
+    return trace_config
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed, roughly logarithmic buckets.
+
+    Percentiles are interpolated within the bucket they fall in, which is
+    precise enough to tell a slow link from a slow device at constant memory.
+    """
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Initialize an empty histogram."""
+        self._bounds = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        value = seconds * 1000
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        self._max = max(self._max, value)
+
+    def percentile(self, fraction: float) -> float:
+        """Return the estimated latency in ms below which `fraction` of samples fall."""
+        if not self._count:
+            return 0.0
+        rank = fraction * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if count and seen + count >= rank:
+                lower = self._bounds[index - 1] if index else 0.0
+                upper = self._bounds[index] if index < len(self._bounds) else self._max
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(value, self._max)
+            seen += count
+        return self._max
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the sample count, mean, max and p50/p95/p99 in ms."""
+        return {
+            "count": self._count,
+            "mean_ms": round(self._total / self._count, 1) if self._count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self._max, 1),
+        }
+
+
+@callback
+def async_create_device_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return a session for the EnergyMe client of a config entry.
+
+    Created by the Home Assistant helper, it shares Home Assistant's
+    connection pool and defaults and is detached when the entry is unloaded
+    or Home Assistant stops. The request scheduler of the host keeps a
+    single request in flight, so the ESP32 web server only sees one
+    keep-alive connection from Home Assistant.
+    """
+    return async_create_clientsession(hass, trace_configs=[_trace_config()])
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant, host: str) -> "RequestScheduler":
+    """Return the request scheduler shared by every client of a host."""
+    schedulers: dict[str, RequestScheduler] = hass.data.setdefault(DATA_SCHEDULERS, {})
+    if host not in schedulers:
+        schedulers[host] = RequestScheduler()
+    return schedulers[host]
+
+
+class RequestScheduler:
+    """Serialize and prioritize the requests sent to one device.
+
+    At most `max_in_flight` requests run at once; the others wait in a
+    priority queue so meter values overtake system and update-info requests
+    when the coordinators and config flows hit the device together.
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT_REQUESTS) -> None:
+        """Initialize the scheduler."""
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._waiting = 0
+        self._max_queue_depth = 0
+        self._requests: dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+        self._wait_total: dict[RequestPriority, float] = dict.fromkeys(RequestPriority, 0.0)
+        self._wait_max: dict[RequestPriority, float] = dict.fromkeys(RequestPriority, 0.0)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return self._waiting
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the queue-depth and wait-time counters."""
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "max_queue_depth": self._max_queue_depth,
+            "priorities": {
+                priority.name.lower(): {
+                    "requests": self._requests[priority],
+                    "wait_total_ms": round(self._wait_total[priority] * 1000, 1),
+                    "wait_avg_ms": round(
+                        self._wait_total[priority] * 1000 / self._requests[priority], 1
+                    ) if self._requests[priority] else 0.0,
+                    "wait_max_ms": round(self._wait_max[priority] * 1000, 1),
+                }
+                for priority in RequestPriority
+            },
+        }
+
+    @asynccontextmanager
+    async def async_slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait for a request slot, served by priority then arrival order."""
+        start = time.monotonic()
+        if self._in_flight < self._max_in_flight and not self._waiting:
+            self._in_flight += 1
+        else:
+            await self._async_wait(priority)
+
+        wait = time.monotonic() - start
+        self._requests[priority] += 1
+        self._wait_total[priority] += wait
+        self._wait_max[priority] = max(self._wait_max[priority], wait)
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_wait(self, priority: RequestPriority) -> None:
+        """Queue up until a finishing request hands its slot over."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self._waiting += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._waiting)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+        finally:
+            self._waiting -= 1
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiting request, or free it."""
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
+
+
+class CircuitState(StrEnum):
+    """State of the circuit breaker of a device."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Suspend the requests to a device that stopped answering.
+
+    After `failure_threshold` consecutive connection failures the circuit
+    opens: requests fail immediately instead of each waiting for the request
+    timeout. Once the backoff delay (doubled on every failed probe, with
+    jitter) has passed, the circuit is half-open and a single cheap health
+    probe decides whether normal traffic resumes.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        backoff_min: float = CIRCUIT_BACKOFF_MIN,
+        backoff_max: float = CIRCUIT_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._failures = 0
+        self._open_count = 0
+        self._retry_at = 0.0
+        self._probing = False
+        self._opened_total = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state of the circuit."""
+        if self._failures < self._failure_threshold:
+            return CircuitState.CLOSED
+        if self._probing or time.monotonic() >= self._retry_at:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before the next probe."""
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the state and counters of the circuit."""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in, 1),
+            "opened_total": self._opened_total,
+        }
+
+    def begin_probe(self) -> bool:
+        """Claim the probe of a half-open circuit, False if already claimed."""
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def abort_probe(self) -> None:
+        """Release the probe claim without an outcome."""
+        self._probing = False
+
+    def record_success(self) -> bool:
+        """Close the circuit, return True if it was not closed."""
+        was_tripped = self._failures >= self._failure_threshold
+        self._failures = 0
+        self._open_count = 0
+        self._probing = False
+        return was_tripped
+
+    def record_failure(self) -> bool:
+        """Count a connection failure, return True if the circuit just opened."""
+        self._failures += 1
+        self._probing = False
+        if self._failures < self._failure_threshold:
+            return False
+
+        delay = min(self._backoff_min * 2**self._open_count, self._backoff_max)
+        self._retry_at = time.monotonic() + random.uniform(delay / 2, delay)
+        self._open_count += 1
+        if self._open_count == 1:
+            self._opened_total += 1
+            return True
+        return False
+
+
+class DigestAuth:
+    """HTTP digest authentication (RFC 7616) for the EnergyMe web server.
+
+    The last challenge is cached so requests can be authorized preemptively
+    with an incrementing nonce count instead of paying a 401 round trip each.
+    """
+
+    def __init__(self, username: str, password: str) -> None:
+        """Initialize the digest authenticator."""
+        self._username = username
+        self._password = password
+        self._challenge: dict[str, str] = {}
+        self._nonce_count = 0
+
+    @property
+    def has_challenge(self) -> bool:
+        """Return True if a nonce is cached and requests can be preemptive."""
+        return bool(self._challenge)
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the last challenge flagged the previous nonce as stale."""
+        return self._challenge.get("stale", "").lower() == "true"
+
+    def handle_challenge(self, header: str | None) -> bool:
+        """Cache a `WWW-Authenticate` challenge, return False if unusable."""
+        self._challenge = {}
+        if not header:
+            return False
+        scheme, _, params = header.partition(" ")
+        if scheme.lower() != "digest":
+            return False
+        challenge = parse_keqv_list(parse_http_list(params))
+        if "nonce" not in challenge or "realm" not in challenge:
+            return False
+        self._challenge = challenge
+        self._nonce_count = 0
+        return True
+
+    def build_header(self, method: str, path: str) -> str:
+        """Build the `Authorization` header for a request."""
+        challenge = self._challenge
+        realm = challenge["realm"]
+        nonce = challenge["nonce"]
+        algorithm = challenge.get("algorithm", "MD5")
+        qop_options = [q.strip() for q in challenge.get("qop", "").split(",")]
+
+        if algorithm.upper().startswith("SHA-256"):
+            hash_fn = hashlib.sha256
+        else:
+            hash_fn = hashlib.md5
+
+        def _hash(value: str) -> str:
+            return hash_fn(value.encode()).hexdigest()
+
+        self._nonce_count += 1
+        nonce_count = f"{self._nonce_count:08x}"
+        cnonce = os.urandom(8).hex()
+
+        ha1 = _hash(f"{self._username}:{realm}:{self._password}")
+        if algorithm.upper().endswith("-SESS"):
+            ha1 = _hash(f"{ha1}:{nonce}:{cnonce}")
+        ha2 = _hash(f"{method}:{path}")
+
+        fields = {
+            "username": self._username,
+            "realm": realm,
+            "nonce": nonce,
+            "uri": path,
+            "algorithm": algorithm,
+        }
+        if "auth" in qop_options:
+            fields["response"] = _hash(f"{ha1}:{nonce}:{nonce_count}:{cnonce}:auth:{ha2}")
+        else:
+            fields["response"] = _hash(f"{ha1}:{nonce}:{ha2}")
+        if "opaque" in challenge:
+            fields["opaque"] = challenge["opaque"]
+
+        header = "Digest " + ", ".join(f'{key}="{value}"' for key, value in fields.items())
+        if "auth" in qop_options:
+            header += f', qop=auth, nc={nonce_count}, cnonce="{cnonce}"'
+        return header
+
+
+class EnergyMeClient:
+    """Async client for a single EnergyMe device.
+
+    Every request is timed per endpoint and phase: `connect` (opening a new
+    TCP connection), `challenge` (a round trip answered with a digest
+    challenge), `server` (request sent until the response headers arrive,
+    mostly the device generating the JSON), `body` (reading and decoding the
+    body) and `total`.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        username: str,
+        password: str,
+        timeout: float = TIMEOUT_REQUESTS,
+        scheduler: RequestScheduler | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._host = host
+        self._auth = DigestAuth(username, password)
+        self._connect_timeout = timeout
+        self._read_timeouts: dict[RequestPriority, float] = dict.fromkeys(RequestPriority, timeout)
+        self._scheduler = scheduler or RequestScheduler()
+        self._circuit_breaker = circuit_breaker
+        self._latency: dict[str, dict[str, LatencyHistogram]] = {}
+
+    @property
+    def host(self) -> str:
+        """Return the host of the device."""
+        return self._host
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """Return the request scheduler of the device."""
+        return self._scheduler
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """Return the circuit breaker of the device, if any."""
+        return self._circuit_breaker
+
+    @property
+    def latency_stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the latency percentiles of every endpoint and phase."""
+        return {
+            endpoint: {phase: histogram.stats for phase, histogram in phases.items()}
+            for endpoint, phases in self._latency.items()
+        }
+
+    def set_timeouts(
+        self, connect_timeout: float, read_timeouts: Mapping[RequestPriority, float]
+    ) -> None:
+        """Set the connect timeout and the read timeout of each request priority."""
+        self._connect_timeout = connect_timeout
+        self._read_timeouts.update(read_timeouts)
+
+    def _client_timeout(
+        self, priority: RequestPriority, timeout: float | None = None
+    ) -> aiohttp.ClientTimeout:
+        """Return the timeouts of one round trip to the device."""
+        connect = timeout or self._connect_timeout
+        read = timeout or self._read_timeouts[priority]
+        return aiohttp.ClientTimeout(total=connect + read, sock_connect=connect, sock_read=read)
+
+    def _record_latency(self, endpoint: str, phase: str, seconds: float) -> None:
+        """Add a latency sample of an endpoint."""
+        phases = self._latency.setdefault(endpoint, {})
+        if phase not in phases:
+            phases[phase] = LatencyHistogram()
+        phases[phase].record(seconds)
+
+    async def async_get_system_info(
+        self, priority: RequestPriority | None = None
+    ) -> dict[str, Any]:
+        """Fetch the system information fields read by the integration."""
+        return project(
+            await self.async_get_json(ENDPOINT_SYSTEM_INFO, priority), SYSTEM_INFO_SCHEMA
+        )
+
+    async def async_get_update_info(self) -> dict[str, Any]:
+        """Fetch the firmware update information fields read by the integration."""
+        return project(await self.async_get_json(ENDPOINT_UPDATE_INFO), UPDATE_INFO_SCHEMA)
+
+    async def async_get_channel_config(self) -> Any:
+        """Fetch the channel configuration."""
+        return await self.async_get_json(ENDPOINT_CHANNEL)
+
+    async def async_get_meter_values(self) -> Any:
+        """Fetch the real-time meter values of all channels."""
+        return await self.async_get_json(ENDPOINT_METER_VALUES)
+
+    async def async_stream_meter_values(
+        self, on_meter_values: Callable[[Any], None]
+    ) -> None:
+        """Follow the server-sent meter values stream until it ends.
+
+        The stream holds its connection for as long as it lives, so it uses a
+        dedicated session instead of the shared keep-alive connection and does
+        not go through the request scheduler. Each `data:` event is decoded and
+        passed to `on_meter_values`.
+        """
+        url = f"http://{self._host}{ENDPOINT_METER_VALUES_STREAM}"
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=self._connect_timeout, sock_read=STREAM_READ_TIMEOUT
+        )
+        try:
+            async with aiohttp.ClientSession(
+                timeout=timeout, headers={"accept": "text/event-stream"}
+            ) as session:
+                for attempt in range(2):
+                    headers = self._auth_headers(ENDPOINT_METER_VALUES_STREAM)
+                    async with session.get(url, headers=headers) as response:
+                        if response.status == HTTPStatus.UNAUTHORIZED:
+                            if attempt or not self._auth.handle_challenge(
+                                response.headers.get("WWW-Authenticate")
+                            ):
+                                raise EnergyMeAuthError(
+                                    f"Authentication failed for EnergyMe device at {self._host}"
+                                )
+                            continue
+                        if response.status >= HTTPStatus.BAD_REQUEST:
+                            raise EnergyMeResponseError(
+                                f"HTTP {response.status} from EnergyMe device at {self._host} "
+                                f"for {ENDPOINT_METER_VALUES_STREAM}",
+                                status=response.status,
+                            )
+                        await self._async_read_events(response, on_meter_values)
+                        return
+        except TimeoutError as err:
+            raise EnergyMeTimeoutError(
+                f"Meter values stream of EnergyMe device at {self._host} stalled"
+            ) from err
+        except aiohttp.ClientError as err:
+            raise EnergyMeConnectionError(
+                f"Meter values stream of EnergyMe device at {self._host} dropped: {err}"
+            ) from err
+
+    async def _async_read_events(
+        self, response: aiohttp.ClientResponse, on_meter_values: Callable[[Any], None]
+    ) -> None:
+        """Parse server-sent events and pass the decoded payloads on.
+
+        An event that cannot be decoded, or that `on_meter_values` fails to
+        handle, is logged and skipped without ending the stream.
+        """
+        data_lines: list[str] = []
+        async for raw_line in response.content:
+            # A corrupted byte must not end the stream
+            line = raw_line.decode(errors="replace").rstrip("\r\n")
+            if line.startswith("data:"):
+                data_lines.append(line[len("data:"):].lstrip())
+            elif not line and data_lines:
+                try:
+                    payload = json_loads("\n".join(data_lines))
+                except ValueError as err:
+                    _LOGGER.debug("Ignoring invalid stream event from %s: %s", self._host, err)
+                else:
+                    try:
+                        on_meter_values(payload)
+                    except Exception:
+                        _LOGGER.exception("Error handling a stream event from %s", self._host)
+                data_lines = []
+            # Comments (heartbeats), event names and ids are ignored
+
+    async def async_get_json(
+        self, endpoint: str, priority: RequestPriority | None = None
+    ) -> Any:
+        """Perform an authenticated GET request and decode the JSON body.
+
+        The request waits for a slot of the host scheduler first; the time
+        spent queued does not count against the request timeouts.
+        """
+        if priority is None:
+            priority = ENDPOINT_PRIORITIES.get(endpoint, RequestPriority.CONFIG)
+        if self._circuit_breaker is None:
+            async with self._scheduler.async_slot(priority):
+                return await self._async_request_json(endpoint, priority)
+
+        await self._async_check_circuit()
+        return await self._async_guarded_request_json(endpoint, priority)
+
+    async def _async_check_circuit(self) -> None:
+        """Fail fast while the circuit is open, probe the device when half-open."""
+        breaker = self._circuit_breaker
+        state = breaker.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.OPEN or not breaker.begin_probe():
+            raise EnergyMeCircuitOpenError(
+                f"EnergyMe device at {self._host} is unreachable, "
+                f"next probe in {breaker.retry_in:.0f} s"
+            )
+
+        _LOGGER.debug("Probing unreachable EnergyMe device at %s", self._host)
+        try:
+            await self._async_guarded_request_json(
+                ENDPOINT_HEALTH, RequestPriority.METER, TIMEOUT_HEALTH_PROBE
+            )
+        except EnergyMeConnectionError as err:
+            raise EnergyMeCircuitOpenError(
+                f"EnergyMe device at {self._host} is still unreachable, "
+                f"next probe in {breaker.retry_in:.0f} s"
+            ) from err
+        except EnergyMeError:
+            # Any answer, even an error response, means the device is back
+            pass
+        finally:
+            # Without an outcome (cancelled, closed session...) the next
+            # caller probes again; after one the claim is already released
+            breaker.abort_probe()
+
+    async def _async_guarded_request_json(
+        self, endpoint: str, priority: RequestPriority, timeout: float | None = None
+    ) -> Any:
+        """Run the request and record its outcome in the circuit breaker.
+
+        Only connection failures count: an error response still means the
+        device is reachable.
+        """
+        breaker = self._circuit_breaker
+        try:
+            async with self._scheduler.async_slot(priority):
+                result = await self._async_request_json(endpoint, priority, timeout)
+        except EnergyMeConnectionError:
+            if breaker.record_failure():
+                _LOGGER.warning(
+                    "EnergyMe device at %s is unreachable, suspending requests "
+                    "and probing it every %s to %s seconds",
+                    self._host,
+                    CIRCUIT_BACKOFF_MIN,
+                    CIRCUIT_BACKOFF_MAX,
+                )
+            raise
+        except EnergyMeError:
+            self._record_circuit_success()
+            raise
+        self._record_circuit_success()
+        return result
+
+    def _record_circuit_success(self) -> None:
+        """Close the circuit after an answer from the device."""
+        if self._circuit_breaker.record_success():
+            _LOGGER.info("EnergyMe device at %s is reachable again", self._host)
+
+    async def _async_request_json(
+        self, endpoint: str, priority: RequestPriority, timeout: float | None = None
+    ) -> Any:
+        """Run the request and map transport errors to client errors."""
+        client_timeout = self._client_timeout(priority, timeout)
+        start = time.monotonic()
+        try:
+            try:
+                result = await self._async_get_json(endpoint, client_timeout)
+            except aiohttp.ServerDisconnectedError:
+                # The device may drop an idle keep-alive connection right
+                # as it is reused; GETs are idempotent, so retry once.
+                _LOGGER.debug(
+                    "Keep-alive connection to %s was closed, retrying %s",
+                    self._host,
+                    endpoint,
+                )
+                result = await self._async_get_json(endpoint, client_timeout)
+        except TimeoutError as err:
+            raise EnergyMeTimeoutError(
+                f"Timeout connecting to EnergyMe device at {self._host}"
+            ) from err
+        except aiohttp.ClientConnectionError as err:
+            raise EnergyMeConnectionError(
+                f"Error connecting to EnergyMe device at {self._host}: {err}"
+            ) from err
+        except aiohttp.ClientError as err:
+            raise EnergyMeResponseError(
+                f"Invalid response from EnergyMe device at {self._host}: {err}"
+            ) from err
+        except ValueError as err:
+            raise EnergyMeResponseError(
+                f"Invalid JSON from EnergyMe device at {self._host}: {err}"
+            ) from err
+        self._record_latency(endpoint, "total", time.monotonic() - start)
+        return result
+
+    async def _async_get_json(self, endpoint: str, timeout: aiohttp.ClientTimeout) -> Any:
+        """Run the request, answering a digest challenge only when needed."""
+        url = f"http://{self._host}{endpoint}"
+
+        # Authorize preemptively with the cached nonce, if any
+        used_cached_nonce = self._auth.has_challenge
+        timing = RequestTiming()
+        start = time.monotonic()
+        headers = {"accept": "application/json", **self._auth_headers(endpoint)}
+        async with self._session.get(
+            url, headers=headers, timeout=timeout, trace_request_ctx=timing
+        ) as response:
+            if response.status != HTTPStatus.UNAUTHORIZED:
+                return await self._async_decode(endpoint, response, start, timing)
+            challenge = response.headers.get("WWW-Authenticate")
+        self._record_latency(endpoint, "challenge", time.monotonic() - start)
+
+        if not self._auth.handle_challenge(challenge):
+            raise EnergyMeAuthError(
+                f"Authentication failed for EnergyMe device at {self._host}"
+            )
+        if used_cached_nonce:
+            # The device rejected the cached nonce (stale, or forgotten after a
+            # reboot): answer the new challenge once before giving up.
+            _LOGGER.debug(
+                "Cached nonce for %s was rejected (stale: %s), re-authenticating",
+                self._host,
+                self._auth.stale,
+            )
+
+        timing = RequestTiming()
+        start = time.monotonic()
+        headers = {"accept": "application/json", **self._auth_headers(endpoint)}
+        async with self._session.get(
+            url, headers=headers, timeout=timeout, trace_request_ctx=timing
+        ) as response:
+            if response.status == HTTPStatus.UNAUTHORIZED:
+                self._auth.handle_challenge(None)
+                raise EnergyMeAuthError(
+                    f"Authentication failed for EnergyMe device at {self._host}"
+                )
+            return await self._async_decode(endpoint, response, start, timing)
+
+    def _auth_headers(self, endpoint: str) -> dict[str, str]:
+        """Return the authorization headers for a request, if a nonce is cached."""
+        if not self._auth.has_challenge:
+            return {}
+        return {"Authorization": self._auth.build_header("GET", endpoint)}
+
+    async def _async_decode(
+        self,
+        endpoint: str,
+        response: aiohttp.ClientResponse,
+        start: float,
+        timing: RequestTiming,
+    ) -> Any:
+        """Check the status and decode the JSON body of a response."""
+        headers_received = time.monotonic()
+        connect = timing.connect or 0.0
+        if timing.connect is not None:
+            self._record_latency(endpoint, "connect", connect)
+        self._record_latency(endpoint, "server", headers_received - start - connect)
+
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            raise EnergyMeResponseError(
+                f"HTTP {response.status} from EnergyMe device at {self._host} "
+                f"for {response.url.path}",
+                status=response.status,
+            )
+        body = await response.read()
+        body_received = time.monotonic()
+        self._record_latency(endpoint, "body", body_received - headers_received)
+
+        # Like ClientResponse.json(), an empty body decodes to None
+        data = json_loads(body) if body.strip() else None
+        self._record_latency(endpoint, "decode", time.monotonic() - body_received)
+        return data
@@ -0,0 +1,102 @@
+"""Last known device data, persisted for an instant startup.
+
+The channel configuration, the last meter values and the system data of a
+device are saved in a Store, at most once every CACHE_SAVE_DELAY seconds.
+At startup they are restored into the coordinators, so the entities are
+created right away and the first refresh runs in the background instead of
+blocking (or failing) the setup while the device is slow or offline.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CACHE_SAVE_DELAY, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import EnergyMeMeterCoordinator, EnergyMeSystemCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def async_remove_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the cache of a removed config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+class EnergyMeCache:
+    """Persist the coordinator data of a device."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the cache."""
+        self._store = _store(hass, entry.entry_id)
+        self._meter_coordinator: EnergyMeMeterCoordinator | None = None
+        self._system_coordinator: EnergyMeSystemCoordinator | None = None
+        self._save_scheduled = False
+        self._flushed = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the cached data, or None if there is none."""
+        return await self._store.async_load()
+
+    @callback
+    def async_track(
+        self,
+        meter_coordinator: "EnergyMeMeterCoordinator",
+        system_coordinator: "EnergyMeSystemCoordinator",
+    ) -> None:
+        """Save the data of the coordinators as they are updated."""
+        self._meter_coordinator = meter_coordinator
+        self._system_coordinator = system_coordinator
+        meter_coordinator.config_entry.async_on_unload(
+            meter_coordinator.async_add_listener(self.async_schedule_save)
+        )
+        system_coordinator.config_entry.async_on_unload(
+            system_coordinator.async_add_listener(self.async_schedule_save)
+        )
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the data within CACHE_SAVE_DELAY.
+
+        The store restarts its delay on every call, so with updates coming
+        faster than the delay it is only asked once until the data is saved.
+        """
+        if self._save_scheduled or self._flushed:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the data of a pending save now, which cancels the delayed write.
+
+        Called when the entry is unloaded: the delayed write would otherwise
+        still fire afterwards, and recreate the store of a removed entry.
+        Updates until the listeners are removed are no longer saved.
+        """
+        self._flushed = True
+        if self._save_scheduled:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to save, called by the store when it writes."""
+        self._save_scheduled = False
+        meter = self._meter_coordinator
+        system = self._system_coordinator.data or {}
+        return {
+            "channel_config": meter.channel_config,
+            "meter_values": meter.meter_values,
+            "device_info": system.get("device_info", {}),
+            "update_info": system.get("update_info", {}),
+        }
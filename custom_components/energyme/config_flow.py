@@ -2,16 +2,53 @@
 import logging
 from typing import Any
 
-import requests
-from requests.auth import HTTPDigestAuth
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.const import CONF_NAME
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
-from .const import DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_POWER_CHANGE_THRESHOLD,
+    CONF_STREAMING,
+    CONF_CONNECT_TIMEOUT,
+    CONF_METER_READ_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    CONF_STATE_MAX_AGE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_DEADBAND_PREFIX,
+    CONF_TOTALS_EXCLUDED_CHANNELS,
+    CONF_SAMPLE_BUFFER_SIZE,
+    DEFAULT_SAMPLE_BUFFER_SIZE,
+    MAX_SAMPLE_BUFFER_SIZE,
+    CHANNEL_COUNT,
+    DEADBAND_METRICS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POWER_CHANGE_THRESHOLD,
+    DEFAULT_STREAMING,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_METER_READ_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_DEADBAND,
+    TIMEOUT_CONNECTION_TEST,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,31 +84,43 @@ class EnergyMeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             Tuple of (system_info dict, None) on success, or (None, error_key) on failure.
 
         """
-        try:
-            info_url = f"http://{host}/api/v1/system/info"
-
-            def make_request():
-                return requests.get(
-                    info_url,
-                    auth=HTTPDigestAuth(username, password),
-                    timeout=5,
-                    headers={"accept": "application/json"}
-                )
+        # Imported on first use (in the executor): the flow is loaded on every
+        # zeroconf discovery of a device, the HTTP client is only needed once
+        # credentials are tested
+        await async_import_module(self.hass, f"{__package__}.api")
+        from .api import (
+            EnergyMeAuthError,
+            EnergyMeClient,
+            EnergyMeConnectionError,
+            EnergyMeResponseError,
+            EnergyMeTimeoutError,
+            RequestPriority,
+            async_get_scheduler,
+        )
 
-            response = await self.hass.async_add_executor_job(make_request)
-            response.raise_for_status()
-            return response.json(), None
+        # A one-off test: Home Assistant's shared session will do
+        client = EnergyMeClient(
+            async_get_clientsession(self.hass),
+            host,
+            username,
+            password,
+            timeout=TIMEOUT_CONNECTION_TEST,
+            scheduler=async_get_scheduler(self.hass, host),
+        )
+        try:
+            return await client.async_get_system_info(RequestPriority.CONFIG), None
 
-        except requests.exceptions.Timeout:
+        except EnergyMeTimeoutError:
             _LOGGER.error("Timeout connecting to %s", host)
             return None, "cannot_connect_timeout"
-        except requests.exceptions.ConnectionError:
+        except EnergyMeConnectionError:
             _LOGGER.error("Failed to connect to %s", host)
             return None, "cannot_connect"
-        except requests.exceptions.HTTPError as err:
+        except EnergyMeAuthError as err:
+            _LOGGER.error("HTTP error connecting to %s: %s", host, err)
+            return None, "invalid_auth"
+        except EnergyMeResponseError as err:
             _LOGGER.error("HTTP error connecting to %s: %s", host, err)
-            if err.response.status_code == 401:
-                return None, "invalid_auth"
             return None, "cannot_connect_http"
         except Exception as e:
             _LOGGER.exception("Unexpected exception: %s", e)
@@ -379,30 +428,112 @@ class EnergyMeOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
-        if user_input is not None:
-            scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
-            # Create the final options data with only scan interval
-            options_data = {
-                CONF_SCAN_INTERVAL: scan_interval,
-            }
-
-            return self.async_create_entry(title="", data=options_data)
+        errors = {}
+        options = self.config_entry.options
 
-        current_scan_interval = self.config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        )
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_interval_range"
+            else:
+                # Create the final options data
+                options_data = {
+                    CONF_SCAN_INTERVAL: user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    CONF_ADAPTIVE_POLLING: user_input[CONF_ADAPTIVE_POLLING],
+                    CONF_MIN_SCAN_INTERVAL: user_input[CONF_MIN_SCAN_INTERVAL],
+                    CONF_MAX_SCAN_INTERVAL: user_input[CONF_MAX_SCAN_INTERVAL],
+                    CONF_POWER_CHANGE_THRESHOLD: user_input[CONF_POWER_CHANGE_THRESHOLD],
+                    CONF_STREAMING: user_input[CONF_STREAMING],
+                    CONF_CONNECT_TIMEOUT: user_input[CONF_CONNECT_TIMEOUT],
+                    CONF_METER_READ_TIMEOUT: user_input[CONF_METER_READ_TIMEOUT],
+                    CONF_READ_TIMEOUT: user_input[CONF_READ_TIMEOUT],
+                    CONF_STATE_MAX_AGE: user_input[CONF_STATE_MAX_AGE],
+                    CONF_MIN_WRITE_INTERVAL: user_input[CONF_MIN_WRITE_INTERVAL],
+                    CONF_SAMPLE_BUFFER_SIZE: user_input[CONF_SAMPLE_BUFFER_SIZE],
+                }
+                for metric in DEADBAND_METRICS:
+                    key = f"{CONF_DEADBAND_PREFIX}{metric}"
+                    options_data[key] = user_input[key]
+                options_data[CONF_TOTALS_EXCLUDED_CHANNELS] = user_input[CONF_TOTALS_EXCLUDED_CHANNELS]
+
+                return self.async_create_entry(title="", data=options_data)
+            options = user_input
+
+        # Channels offered for exclusion from the totals, with their current labels
+        channel_labels = {}
+        coordinators = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinators:
+            channel_labels = coordinators["meter_coordinator"].channel_labels
+        channel_choices = {
+            str(index): f"{index} - {channel_labels.get(index, f'Channel {index}')}"
+            for index in range(CHANNEL_COUNT)
+        }
 
         options_schema = vol.Schema({
             vol.Optional(
                 CONF_SCAN_INTERVAL,
-                default=current_scan_interval,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
             ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            ): bool,
+            vol.Optional(
+                CONF_MIN_SCAN_INTERVAL,
+                default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_MAX_SCAN_INTERVAL,
+                default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_POWER_CHANGE_THRESHOLD,
+                default=options.get(CONF_POWER_CHANGE_THRESHOLD, DEFAULT_POWER_CHANGE_THRESHOLD),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_STREAMING,
+                default=options.get(CONF_STREAMING, DEFAULT_STREAMING),
+            ): bool,
+            vol.Optional(
+                CONF_CONNECT_TIMEOUT,
+                default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            vol.Optional(
+                CONF_METER_READ_TIMEOUT,
+                default=options.get(CONF_METER_READ_TIMEOUT, DEFAULT_METER_READ_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            vol.Optional(
+                CONF_READ_TIMEOUT,
+                default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            vol.Optional(
+                CONF_STATE_MAX_AGE,
+                default=options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                CONF_MIN_WRITE_INTERVAL,
+                default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_SAMPLE_BUFFER_SIZE,
+                default=options.get(CONF_SAMPLE_BUFFER_SIZE, DEFAULT_SAMPLE_BUFFER_SIZE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_SAMPLE_BUFFER_SIZE)),
+            **{
+                vol.Optional(
+                    f"{CONF_DEADBAND_PREFIX}{metric}",
+                    default=options.get(f"{CONF_DEADBAND_PREFIX}{metric}", DEFAULT_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0))
+                for metric in DEADBAND_METRICS
+            },
+            vol.Optional(
+                CONF_TOTALS_EXCLUDED_CHANNELS,
+                default=options.get(CONF_TOTALS_EXCLUDED_CHANNELS, []),
+            ): cv.multi_select(channel_choices),
         })
 
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
+            errors=errors,
             description_placeholders={
                 "scan_interval_help": "Set the polling interval in seconds for meter data (voltage, power, energy, etc.)."
             }
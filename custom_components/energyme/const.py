@@ -11,17 +11,101 @@ CONF_PASSWORD = "password"
 DEFAULT_SCAN_INTERVAL = 10 # Seconds - for meter data
 CONF_SCAN_INTERVAL = "scan_interval" # Added for options flow
 SYSTEM_SCAN_INTERVAL = 900 # Seconds (15 minutes) - fixed interval for system sensors (not critical data)
+CHANNEL_CONFIG_TTL = 3600 # Seconds (1 hour) - how long the cached channel configuration is trusted
+CHANNEL_CONFIG_MIN_AGE = 60 # Seconds - minimum age before meter values may trigger an early channel configuration refresh
 
-# System sensors are always created regardless of sensor selection
-# These update on a fixed interval on a separate coordinator
-SYSTEM_SENSORS = [
-    "firmware_version",
-    "device_id",
-    "temperature",
-    "wifi_rssi",
-    "wifi_local_ip",
-    "heap_free_percentage",
-    "uptime",
-    "storage_free",
-    "update_available",
-]
+# Adaptive polling (options flow)
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_POWER_CHANGE_THRESHOLD = "power_change_threshold"
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_SCAN_INTERVAL = 1 # Seconds - interval used while loads are changing
+DEFAULT_MAX_SCAN_INTERVAL = 60 # Seconds - interval reached when loads are steady
+DEFAULT_POWER_CHANGE_THRESHOLD = 50 # Watts - activePower change on any channel that counts as a load event
+ADAPTIVE_BACKOFF_FACTOR = 1.5 # Interval growth per poll without a load event
+ADAPTIVE_LATENCY_RATIO = 0.5 # Back off when a poll takes more than this fraction of the interval
+
+# Streaming (options flow)
+CONF_STREAMING = "streaming"
+DEFAULT_STREAMING = False
+STREAM_READ_TIMEOUT = 30 # Seconds without an event (or heartbeat) before the stream is considered dropped
+STREAM_RECONNECT_MIN = 5 # Seconds - first delay before reconnecting a dropped stream
+STREAM_RECONNECT_MAX = 300 # Seconds - maximum delay between reconnection attempts
+
+# Request timeouts (options flow)
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_METER_READ_TIMEOUT = "meter_read_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+DEFAULT_CONNECT_TIMEOUT = 5 # Seconds - opening a TCP connection to the device
+DEFAULT_METER_READ_TIMEOUT = 10 # Seconds - waiting for the meter values response
+DEFAULT_READ_TIMEOUT = 10 # Seconds - waiting for the channel configuration, system and update info responses
+
+# State writes (options flow)
+CONF_STATE_MAX_AGE = "state_max_age"
+DEFAULT_STATE_MAX_AGE = 0 # Seconds - rewrite an unchanged meter sensor state after this long (0 = never)
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+DEFAULT_MIN_WRITE_INTERVAL = 0 # Seconds - minimum time between two state writes of a meter sensor
+CONF_DEADBAND_PREFIX = "deadband_" # Option key of a metric deadband, e.g. deadband_voltage
+DEFAULT_DEADBAND = 0 # Changes smaller than or equal to the deadband are not written (0 = any change)
+DEADBAND_METRICS = (
+    "voltage",
+    "current",
+    "activePower",
+    "reactivePower",
+    "apparentPower",
+    "powerFactor",
+)
+
+# Interval statistics of the samples between two state writes (options flow)
+CONF_SAMPLE_BUFFER_SIZE = "sample_buffer_size"
+DEFAULT_SAMPLE_BUFFER_SIZE = 0 # Meter updates kept for the statistics (0 = no statistics)
+MAX_SAMPLE_BUFFER_SIZE = 600 # 1,496 bytes per sample (11 metrics x 17 channels), about 150 kB per device per 100 samples
+
+# Derived sensors, computed across channels (options flow)
+CONF_TOTALS_EXCLUDED_CHANNELS = "totals_excluded_channels" # Channels left out of the totals, e.g. a mains CT on channel 0
+PHASE_COUNT = 3 # Phases a channel can be assigned to
+
+# Persistent cache of the last known device data
+CACHE_SAVE_DELAY = 60 # Seconds - maximum delay before updated data is written to storage
+
+# Fleet polling (meter polls of every device share one scheduler)
+FLEET_MAX_CONCURRENT_POLLS = 4 # Meter polls running at once across all devices
+
+# Services
+SERVICE_REFRESH_CHANNEL_CONFIG = "refresh_channel_config"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Device HTTP client
+TIMEOUT_REQUESTS = 10 # Seconds - default connect and read timeout of a single API request
+TIMEOUT_CONNECTION_TEST = 5 # Seconds - timeout used by the config flow connection test
+MAX_IN_FLIGHT_REQUESTS = 1 # Concurrent requests per device - the ESP32 web server handles few sockets
+CIRCUIT_FAILURE_THRESHOLD = 3 # Consecutive connection failures before requests to a device are suspended
+CIRCUIT_BACKOFF_MIN = 15 # Seconds - first delay before probing a suspended device
+CIRCUIT_BACKOFF_MAX = 600 # Seconds - maximum delay between probes of a suspended device
+TIMEOUT_HEALTH_PROBE = 3 # Seconds - timeout of the health probe sent to a suspended device
+LATENCY_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 350, 500, 750, 1000, 2000, 5000, 10000, 30000) # Upper bounds of the latency histogram buckets
+
+# Device API endpoints
+ENDPOINT_HEALTH = "/api/v1/health"
+ENDPOINT_SYSTEM_INFO = "/api/v1/system/info"
+ENDPOINT_UPDATE_INFO = "/api/v1/firmware/update-info"
+ENDPOINT_CHANNEL = "/api/v1/ade7953/channel"
+ENDPOINT_METER_VALUES = "/api/v1/ade7953/meter-values"
+ENDPOINT_METER_VALUES_STREAM = "/api/v1/ade7953/meter-values/stream"
+
+# Meter values read from every channel, in the row order of the meter snapshot
+CHANNEL_COUNT = 17 # Channels supported by the device
+METER_METRICS = (
+    "voltage",
+    "current",
+    "activePower",
+    "reactivePower",
+    "apparentPower",
+    "powerFactor",
+    "activeEnergyImported",
+    "activeEnergyExported",
+    "reactiveEnergyImported",
+    "reactiveEnergyExported",
+    "apparentEnergy",
+)
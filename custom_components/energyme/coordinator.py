@@ -0,0 +1,705 @@
+"""Data update coordinators for the EnergyMe integration."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import (
+    EnergyMeAuthError,
+    EnergyMeCircuitOpenError,
+    EnergyMeClient,
+    EnergyMeConnectionError,
+    EnergyMeError,
+    EnergyMeResponseError,
+    EnergyMeTimeoutError,
+)
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_LATENCY_RATIO,
+    CHANNEL_CONFIG_MIN_AGE,
+    CHANNEL_CONFIG_TTL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_DEADBAND_PREFIX,
+    CONF_HOST,
+    CONF_TOTALS_EXCLUDED_CHANNELS,
+    CONF_SAMPLE_BUFFER_SIZE,
+    DEFAULT_SAMPLE_BUFFER_SIZE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_POWER_CHANGE_THRESHOLD,
+    CONF_SCAN_INTERVAL,
+    CONF_STATE_MAX_AGE,
+    CONF_STREAMING,
+    DEADBAND_METRICS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_POWER_CHANGE_THRESHOLD,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_STREAMING,
+    DOMAIN,
+    ENDPOINT_METER_VALUES,
+    ENDPOINT_SYSTEM_INFO,
+    ENDPOINT_UPDATE_INFO,
+    STREAM_RECONNECT_MAX,
+    STREAM_RECONNECT_MIN,
+    SYSTEM_SCAN_INTERVAL,
+)
+from .fleet import FleetPoller
+from .snapshot import MeterSnapshot, SampleRing, derive_totals, normalize_channel_config
+from .system import extract_system_values
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def channel_device_identifier(entry_id: str, channel_index: int) -> tuple[str, str]:
+    """Return the device registry identifier of a channel device."""
+    return (DOMAIN, f"{entry_id}_ch{channel_index}")
+
+
+def channel_device_name(channel_index: int, label: str) -> str:
+    """Return the name of a channel device."""
+    return f"Channel {channel_index} - {label}"
+
+
+def entry_device_id(entry: ConfigEntry) -> str | None:
+    """Return the device ID stored as the unique ID of an entry.
+
+    The config flow uses the device ID as unique ID, or the host when the
+    device did not report one; None is returned for those legacy entries,
+    whose device ID is only known from the system data.
+    """
+    if entry.unique_id and entry.unique_id != entry.data.get(CONF_HOST):
+        return entry.unique_id
+    return None
+
+
+def _hash_channel_config(channel_config: Any) -> str:
+    """Return a content hash of a channel configuration payload."""
+    return hashlib.sha1(
+        json.dumps(channel_config, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def _channel_config_list(channel_config: Any) -> list[Any]:
+    """Return the channel entries of a channel configuration payload."""
+    if isinstance(channel_config, dict):
+        channel_config = channel_config.get("channels", channel_config.values())
+    return list(channel_config or [])
+
+
+def _active_power_by_channel(snapshot: MeterSnapshot) -> dict[int, float]:
+    """Return the activePower of every channel in a meter snapshot."""
+    return {
+        index: power
+        for index, power in enumerate(snapshot.row("activePower"))
+        if not math.isnan(power)
+    }
+
+
+class FetchPlanner:
+    """Track which device endpoints the enabled entities of a coordinator read.
+
+    Entities register the endpoints they consume when they are added to Home
+    Assistant and release them when they are removed (disabled entities are
+    never added), so the coordinator only calls the endpoints still needed.
+    Until the platform has created its entities, every endpoint is considered
+    needed; from then on, an endpoint no enabled entity reads is not called.
+    """
+
+    def __init__(self, name: str, on_change: Callable[[], None] | None = None) -> None:
+        """Initialize the planner."""
+        self._name = name
+        self._on_change = on_change
+        self._consumers: Counter[str] = Counter()
+        self._planned = False
+
+    @property
+    def endpoints(self) -> list[str] | None:
+        """Return the planned endpoints, or None if the entities are not created yet."""
+        if not self._planned:
+            return None
+        return sorted(self._consumers)
+
+    def needs(self, endpoint: str) -> bool:
+        """Return True if an enabled entity reads the endpoint."""
+        return not self._planned or self._consumers[endpoint] > 0
+
+    @callback
+    def async_add_consumer(self, endpoints: Iterable[str]) -> CALLBACK_TYPE:
+        """Register the endpoints read by an entity, return the release callback."""
+        endpoints = tuple(endpoints)
+        self._consumers.update(endpoints)
+        self._async_plan_changed()
+
+        @callback
+        def _async_remove_consumer() -> None:
+            self._consumers.subtract(endpoints)
+            self._consumers = +self._consumers
+            self._async_plan_changed()
+
+        return _async_remove_consumer
+
+    @callback
+    def async_set_planned(self) -> None:
+        """Plan from the registered consumers only, once the entities are created.
+
+        Called by the platform after adding its entities: with every entity
+        of the coordinator disabled, no consumer ever registers, and no
+        endpoint is needed.
+        """
+        if self._planned:
+            return
+        self._planned = True
+        self._async_plan_changed()
+
+    @callback
+    def _async_plan_changed(self) -> None:
+        """Log the new plan and notify the coordinator."""
+        _LOGGER.debug("Fetch plan of %s: %s", self._name, self.endpoints)
+        if self._on_change is not None:
+            self._on_change()
+
+
+class EnergyMeMeterCoordinator(DataUpdateCoordinator[MeterSnapshot]):
+    """Coordinator polling the meter values.
+
+    Each update is normalized once into a MeterSnapshot keyed by channel
+    index, which the entities read directly.
+
+    The channel configuration rarely changes, so it is cached for
+    CHANNEL_CONFIG_TTL and only re-fetched when it expires, when the meter
+    values hint at a change (unknown channel or new label) or when the
+    refresh_channel_config service is called. A steady-state poll is a single
+    request to the device, and none at all while every meter sensor is
+    disabled.
+
+    With a fleet poller, the polls are timed by the fleet (shared by every
+    device) instead of a timer of the coordinator.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: EnergyMeClient,
+        fleet: FleetPoller | None = None,
+    ) -> None:
+        """Initialize the meter coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_meter_coordinator_{client.host}",
+        )
+        self.client = client
+        self.fleet = fleet
+        self.fetch_planner = FetchPlanner(self.name, self.async_update_streaming)
+        self.channel_config_hash: str | None = None
+        self._channel_config: Any = None
+        # Last meter values payload, saved by the cache
+        self.meter_values: Any = None
+        self._channel_config_fetched = 0.0
+        self._channel_config_expires = 0.0
+        self._channel_config_refreshing = False
+        # Active channels missing from the meter values when the channel
+        # configuration was last re-fetched because of it
+        self._omitted_channels: frozenset[int] = frozenset()
+
+        # Channel labels, reconciled once per channel configuration change.
+        # Entities compare labels_version to pick up new names.
+        self.channel_labels: dict[int, str] = {}
+        self.labels_version = 0
+        # Bumped on every channel configuration change, the sensor platform
+        # compares it to add and remove channels
+        self.channel_config_version = 0
+
+        # Adaptive polling state
+        self.adaptive_polling = DEFAULT_ADAPTIVE_POLLING
+        self.last_poll_duration: float | None = None
+        self._scan_interval = float(DEFAULT_SCAN_INTERVAL)
+        self._min_scan_interval = float(DEFAULT_MIN_SCAN_INTERVAL)
+        self._max_scan_interval = float(DEFAULT_MAX_SCAN_INTERVAL)
+        self._power_change_threshold = float(DEFAULT_POWER_CHANGE_THRESHOLD)
+        self._last_active_power: dict[int, float] = {}
+
+        # State write suppression, counted by the meter sensors
+        self.state_max_age = float(DEFAULT_STATE_MAX_AGE)
+        self.min_write_interval = float(DEFAULT_MIN_WRITE_INTERVAL)
+        self.deadbands: dict[str, float] = {}
+        self.state_writes = 0
+        self.state_writes_skipped = 0
+
+        # Channels left out of the derived totals
+        self.totals_excluded: frozenset[int] = frozenset()
+
+        # Last meter updates, for the interval statistics of the meter sensors
+        self.samples: SampleRing | None = None
+
+        # Streaming state
+        self.streaming = DEFAULT_STREAMING
+        self.stream_connected = False
+        self._stream_task: asyncio.Task | None = None
+        self.apply_options(entry.options)
+
+    @callback
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the polling options of the config entry."""
+        self._scan_interval = float(options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self._min_scan_interval = float(options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+        self._max_scan_interval = float(options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+        self._power_change_threshold = float(
+            options.get(CONF_POWER_CHANGE_THRESHOLD, DEFAULT_POWER_CHANGE_THRESHOLD)
+        )
+        self._last_active_power = {}
+        self.streaming = options.get(CONF_STREAMING, DEFAULT_STREAMING)
+        self.state_max_age = float(options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE))
+        self.min_write_interval = float(
+            options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
+        )
+        buffer_size = int(options.get(CONF_SAMPLE_BUFFER_SIZE, DEFAULT_SAMPLE_BUFFER_SIZE))
+        if not buffer_size:
+            self.samples = None
+        elif self.samples is None or self.samples.capacity != buffer_size:
+            self.samples = SampleRing(buffer_size)
+        self.totals_excluded = frozenset(
+            int(index) for index in options.get(CONF_TOTALS_EXCLUDED_CHANNELS, [])
+        )
+        self.deadbands = {
+            metric: float(options.get(f"{CONF_DEADBAND_PREFIX}{metric}", DEFAULT_DEADBAND))
+            for metric in DEADBAND_METRICS
+        }
+
+        # Adaptive mode starts from the configured interval, within its range
+        interval = self._scan_interval
+        if self.adaptive_polling:
+            interval = min(max(interval, self._min_scan_interval), self._max_scan_interval)
+        self.update_interval = timedelta(seconds=interval)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, on the fleet poller if there is one."""
+        if self.fleet is None:
+            super()._schedule_refresh()
+            return
+        if self.update_interval is None or self.config_entry.pref_disable_polling:
+            return
+        self.fleet.async_schedule(self)
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Cancel the next poll."""
+        if self.fleet is not None:
+            self.fleet.async_unschedule(self)
+        super()._unschedule_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Leave the fleet, which spreads the other devices over its phase."""
+        if self.fleet is not None:
+            self.fleet.async_remove(self)
+        await super().async_shutdown()
+
+    @callback
+    def async_update_streaming(self) -> None:
+        """Start or stop the meter values stream according to the options."""
+        streaming = self.streaming and self.fetch_planner.needs(ENDPOINT_METER_VALUES)
+        if streaming and self._stream_task is None:
+            self._stream_task = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_stream_meter_values(),
+                f"{DOMAIN}_meter_stream_{self.client.host}",
+            )
+        elif not streaming and self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+            self.stream_connected = False
+
+    async def _async_stream_meter_values(self) -> None:
+        """Keep the meter values stream open, polling while it is down.
+
+        Pushed updates reset the polling timer, so the regular poll only
+        fires when the stream stalls; when the stream drops a poll is
+        requested right away and the stream is reconnected with backoff.
+        """
+        reconnect_delay = STREAM_RECONNECT_MIN
+        while True:
+            try:
+                await self.client.async_stream_meter_values(self._async_handle_stream_payload)
+                reason = "closed by the device"
+            except EnergyMeError as err:
+                reason = str(err)
+            except Exception as err:
+                # Never let a bug end the task: async_update_streaming would
+                # not restart it and the entry would silently stay on polling
+                _LOGGER.exception("Unexpected error in the meter values stream of %s", self.client.host)
+                reason = repr(err)
+
+            if self.stream_connected:
+                _LOGGER.info(
+                    "Meter values stream of %s ended (%s), falling back to polling",
+                    self.client.host,
+                    reason,
+                )
+                self.stream_connected = False
+                reconnect_delay = STREAM_RECONNECT_MIN
+                await self.async_request_refresh()
+            else:
+                _LOGGER.debug(
+                    "Meter values stream of %s unavailable (%s), retrying in %s s",
+                    self.client.host,
+                    reason,
+                    reconnect_delay,
+                )
+
+            await asyncio.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, STREAM_RECONNECT_MAX)
+
+    @callback
+    def _async_handle_stream_payload(self, meter_data: Any) -> None:
+        """Push a streamed meter values payload to the entities."""
+        if not self.stream_connected:
+            _LOGGER.info("Receiving meter values from %s over a stream", self.client.host)
+            self.stream_connected = True
+
+        if not self._channel_config_refreshing and self._channel_config_needs_refresh(meter_data):
+            # Without polls nothing else refreshes the cached configuration
+            self._channel_config_refreshing = True
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_refresh_streamed_channel_config(),
+                f"{DOMAIN}_channel_config_{self.client.host}",
+            )
+
+        self.async_set_updated_data(self._build_snapshot(meter_data))
+
+    async def _async_refresh_streamed_channel_config(self) -> None:
+        """Re-fetch the channel configuration while meter values are streamed."""
+        try:
+            await self._async_fetch_channel_config()
+        except EnergyMeError as err:
+            _LOGGER.debug(
+                "Failed to refresh the channel configuration of %s: %s",
+                self.client.host,
+                err,
+            )
+            self._channel_config_expires = time.monotonic() + CHANNEL_CONFIG_MIN_AGE
+        finally:
+            self._channel_config_refreshing = False
+
+    @property
+    def channel_config(self) -> Any:
+        """Return the cached channel configuration payload."""
+        return self._channel_config
+
+    @callback
+    def async_restore(self, channel_config: Any, meter_values: Any) -> None:
+        """Restore the last known channel configuration and meter values.
+
+        The restored configuration is only trusted until the first poll,
+        which re-fetches it.
+        """
+        self.channel_config_hash = _hash_channel_config(channel_config)
+        self._channel_config = channel_config
+        self.channel_config_version += 1
+        self._async_sync_channel_labels()
+        self._channel_config_expires = 0.0
+
+        self.meter_values = meter_values
+        snapshot = MeterSnapshot.from_payloads(channel_config, meter_values)
+        snapshot.derived = derive_totals(snapshot, self.totals_excluded)
+        snapshot.restored = True
+        self.data = snapshot
+
+    def _build_snapshot(self, meter_data: Any) -> MeterSnapshot:
+        """Decode the meter values and compute the series derived across channels."""
+        self.meter_values = meter_data
+        snapshot = MeterSnapshot.from_payloads(self._channel_config, meter_data)
+        snapshot.derived = derive_totals(snapshot, self.totals_excluded)
+        if self.samples is not None:
+            self.samples.append(snapshot)
+        return snapshot
+
+    def _channel_config_needs_refresh(self, meter_data: Any) -> bool:
+        """Return True if the cached channel configuration should be re-fetched."""
+        now = time.monotonic()
+        if now >= self._channel_config_expires:
+            return True
+        return (
+            now - self._channel_config_fetched >= CHANNEL_CONFIG_MIN_AGE
+            and not self._meter_matches_channel_config(meter_data)
+        )
+
+    def _adapt_update_interval(self, snapshot: MeterSnapshot, poll_duration: float) -> None:
+        """Poll faster during load events, back off on steady loads or slow responses."""
+        active_power = _active_power_by_channel(snapshot)
+        load_event = any(
+            abs(power - self._last_active_power[index]) > self._power_change_threshold
+            for index, power in active_power.items()
+            if index in self._last_active_power
+        )
+        self._last_active_power = active_power
+
+        current = self.update_interval.total_seconds() if self.update_interval else self._scan_interval
+        if load_event:
+            interval = self._min_scan_interval
+        else:
+            interval = current * ADAPTIVE_BACKOFF_FACTOR
+
+        # Never poll faster than the device can comfortably answer
+        interval = max(interval, poll_duration / ADAPTIVE_LATENCY_RATIO)
+        interval = min(max(interval, self._min_scan_interval), self._max_scan_interval)
+
+        if interval != current:
+            _LOGGER.debug(
+                "Adaptive polling for %s: %.1f s -> %.1f s (load event: %s, poll took %.2f s)",
+                self.client.host,
+                current,
+                interval,
+                load_event,
+                poll_duration,
+            )
+            self.update_interval = timedelta(seconds=interval)
+
+    async def async_refresh_channel_config(self) -> None:
+        """Re-fetch the channel configuration now and push it to the entities."""
+        self._channel_config_expires = 0.0
+        await self.async_refresh()
+
+    async def _async_fetch_channel_config(self) -> None:
+        """Fetch the channel configuration and detect changes."""
+        channel_config = await self.client.async_get_channel_config()
+        self._channel_config_fetched = time.monotonic()
+        self._channel_config_expires = self._channel_config_fetched + CHANNEL_CONFIG_TTL
+
+        config_hash = _hash_channel_config(channel_config)
+        if config_hash != self.channel_config_hash:
+            if self.channel_config_hash is not None:
+                _LOGGER.info(
+                    "Channel configuration of EnergyMe device at %s changed",
+                    self.client.host,
+                )
+            self.channel_config_hash = config_hash
+            self._channel_config = channel_config
+            self.channel_config_version += 1
+            self._async_sync_channel_labels()
+
+    @callback
+    def _async_sync_channel_labels(self) -> None:
+        """Rename the devices of the channels whose label changed, once each."""
+        channels = normalize_channel_config(self._channel_config)
+        labels = {
+            index: channel.get("label", f"Channel {index}")
+            for index, channel in channels.items()
+        }
+        changed = {
+            index: label
+            for index, label in labels.items()
+            if index in self.channel_labels and self.channel_labels[index] != label
+        }
+        if labels == self.channel_labels:
+            return
+        self.channel_labels = labels
+        self.labels_version += 1
+
+        device_registry = dr.async_get(self.hass)
+        for index, label in changed.items():
+            device = device_registry.async_get_device(
+                identifiers={channel_device_identifier(self.config_entry.entry_id, index)}
+            )
+            if device is None:
+                continue
+            name = channel_device_name(index, label)
+            device_registry.async_update_device(device.id, name=name)
+            _LOGGER.debug("Updated device name for ch%d to: %s", index, name)
+
+    def _meter_matches_channel_config(self, meter_data: Any) -> bool:
+        """Return False if the meter values disagree with the cached channels.
+
+        Active channels left out of the meter values only disagree the first
+        time they are left out: the re-fetch that follows either finds them
+        deactivated or confirms they are active.
+        """
+        if not isinstance(meter_data, list):
+            return True
+
+        channels = {
+            item.get("index"): item
+            for item in _channel_config_list(self._channel_config)
+            if isinstance(item, dict)
+        }
+        reported = set()
+        for item in meter_data:
+            if not isinstance(item, dict):
+                continue
+            channel = channels.get(item.get("index"))
+            if channel is None or not channel.get("active", False):
+                return False
+            if "label" in item and item["label"] != channel.get("label"):
+                return False
+            reported.add(item.get("index"))
+
+        # A channel deactivated on the device is no longer reported, but the
+        # firmware also leaves out an active channel without a valid reading:
+        # the configuration is only re-fetched once for the same omission
+        omitted = frozenset(
+            index
+            for index, channel in channels.items()
+            if channel.get("active", False) and index not in reported
+        )
+        if omitted <= self._omitted_channels:
+            return True
+        self._omitted_channels = omitted
+        return False
+
+    async def _async_update_data(self) -> MeterSnapshot:
+        """Fetch meter data from the device."""
+        host = self.client.host
+        if self.data is not None and not self.fetch_planner.needs(ENDPOINT_METER_VALUES):
+            # Every meter sensor is disabled, keep the device idle
+            return self.data
+        try:
+            if time.monotonic() >= self._channel_config_expires:
+                await self._async_fetch_channel_config()
+
+            poll_start = time.monotonic()
+            meter_data = await self.client.async_get_meter_values()
+            self.last_poll_duration = time.monotonic() - poll_start
+
+            if self._channel_config_needs_refresh(meter_data):
+                _LOGGER.debug(
+                    "Meter values of %s do not match the cached channel configuration, refreshing it",
+                    host,
+                )
+                await self._async_fetch_channel_config()
+
+            snapshot = self._build_snapshot(meter_data)
+            if self.adaptive_polling:
+                self._adapt_update_interval(snapshot, self.last_poll_duration)
+
+            return snapshot
+
+        except EnergyMeAuthError as err:
+            _LOGGER.error("Authentication failed for EnergyMe device at %s", host)
+            raise ConfigEntryAuthFailed(
+                f"Authentication failed for EnergyMe device at {host}"
+            ) from err
+        except EnergyMeResponseError as err:
+            _LOGGER.error("HTTP error from EnergyMe device: %s", err)
+            raise UpdateFailed(f"HTTP error from EnergyMe device: {err}") from err
+        except EnergyMeCircuitOpenError as err:
+            # Logged once by the client when the circuit opens
+            _LOGGER.debug("Skipping update: %s", err)
+            raise UpdateFailed(str(err)) from err
+        except EnergyMeTimeoutError as err:
+            _LOGGER.error("Timeout connecting to EnergyMe device at %s", host)
+            raise UpdateFailed(f"Timeout connecting to EnergyMe device at {host}") from err
+        except EnergyMeConnectionError as err:
+            _LOGGER.error("Error connecting to EnergyMe device at %s", host)
+            raise UpdateFailed(f"Error connecting to EnergyMe device at {host}") from err
+        except EnergyMeError as err:
+            _LOGGER.exception("Unexpected error fetching EnergyMe meter data")
+            raise UpdateFailed(f"Unexpected error: {err}") from err
+
+
+class EnergyMeSystemCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Coordinator polling the system and firmware update information.
+
+    Only the endpoints read by enabled system sensors are fetched; the data
+    of a skipped endpoint is carried over from the previous update. The
+    values of every system sensor are evaluated once per refresh, under
+    "values".
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: EnergyMeClient,
+    ) -> None:
+        """Initialize the system coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_system_coordinator_{client.host}",
+            update_interval=timedelta(seconds=SYSTEM_SCAN_INTERVAL),  # Fixed interval
+        )
+        self.client = client
+        self.fetch_planner = FetchPlanner(self.name)
+
+    @callback
+    def async_restore(self, device_info: dict[str, Any], update_info: dict[str, Any]) -> None:
+        """Restore the last known system and update info."""
+        data = {"device_info": device_info, "update_info": update_info}
+        data["values"] = extract_system_values(data)
+        self.data = data
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch system data from the device."""
+        host = self.client.host
+        previous = self.data or {}
+        try:
+            device_info = previous.get("device_info", {})
+            if self.fetch_planner.needs(ENDPOINT_SYSTEM_INFO):
+                device_info = await self.client.async_get_system_info()
+
+            # Fetch update info (non-critical, handle errors gracefully)
+            update_info = previous.get("update_info", {})
+            if self.fetch_planner.needs(ENDPOINT_UPDATE_INFO):
+                update_info = {}
+                try:
+                    update_info = await self.client.async_get_update_info()
+                except EnergyMeAuthError:
+                    raise
+                except EnergyMeError as err:
+                    _LOGGER.warning(
+                        "Failed to fetch update info from EnergyMe device at %s: %s. "
+                        "Update sensors will be unavailable.",
+                        host,
+                        err
+                    )
+
+            # Combine the data
+            data = {"device_info": device_info, "update_info": update_info}
+            data["values"] = extract_system_values(data)
+            return data
+
+        except EnergyMeAuthError as err:
+            _LOGGER.error("Authentication failed for EnergyMe device at %s for system data", host)
+            raise ConfigEntryAuthFailed(
+                f"Authentication failed for EnergyMe device at {host}"
+            ) from err
+        except EnergyMeResponseError as err:
+            _LOGGER.error("HTTP error from EnergyMe device for system data: %s", err)
+            raise UpdateFailed(f"HTTP error from EnergyMe device: {err}") from err
+        except EnergyMeCircuitOpenError as err:
+            # Logged once by the client when the circuit opens
+            _LOGGER.debug("Skipping update for system data: %s", err)
+            raise UpdateFailed(str(err)) from err
+        except EnergyMeTimeoutError as err:
+            _LOGGER.error("Timeout connecting to EnergyMe device at %s for system data", host)
+            raise UpdateFailed(f"Timeout connecting to EnergyMe device at {host}") from err
+        except EnergyMeConnectionError as err:
+            _LOGGER.error("Error connecting to EnergyMe device at %s for system data", host)
+            raise UpdateFailed(f"Error connecting to EnergyMe device at {host}") from err
+        except EnergyMeError as err:
+            _LOGGER.exception("Unexpected error fetching EnergyMe system data")
+            raise UpdateFailed(f"Unexpected error: {err}") from err
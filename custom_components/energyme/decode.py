@@ -0,0 +1,56 @@
+"""JSON decoding of the device responses.
+
+Bodies are decoded with orjson when it is available (Home Assistant ships
+it) and with the standard library otherwise. Large payloads such as the
+system info are then projected onto the fields the integration reads, so
+the coordinators keep small trees instead of the whole product, hardware
+and SDK blocks.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+# Nested mapping of the fields to keep, a None leaf keeps the whole value
+Schema = dict[str, "Schema | None"]
+
+if orjson is not None:
+    json_loads = orjson.loads
+else:
+    json_loads = json.loads
+
+
+def build_schema(fields: Iterable[str]) -> Schema:
+    """Return the projection schema of dotted field paths."""
+    schema: Schema = {}
+    for field in fields:
+        node = schema
+        *parents, leaf = field.split(".")
+        for key in parents:
+            child = node.get(key)
+            if child is None:
+                child = node[key] = {}
+            node = child
+        node[leaf] = None
+    return schema
+
+
+def project(data: Any, schema: Schema) -> Any:
+    """Return the part of a decoded payload described by the schema.
+
+    Missing fields are left out, so readers keep their `.get()` defaults.
+    """
+    if not isinstance(data, dict):
+        return data
+    projected = {}
+    for key, child in schema.items():
+        if key not in data:
+            continue
+        value = data[key]
+        projected[key] = value if child is None else project(value, child)
+    return projected
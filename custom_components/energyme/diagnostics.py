@@ -0,0 +1,50 @@
+"""Diagnostics support for the EnergyMe integration."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    client = coordinators["client"]
+    meter_coordinator = coordinators["meter_coordinator"]
+    system_coordinator = coordinators["system_coordinator"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "meter_coordinator": {
+            "last_update_success": meter_coordinator.last_update_success,
+            "update_interval": meter_coordinator.update_interval.total_seconds(),
+            "channel_config_hash": meter_coordinator.channel_config_hash,
+            "adaptive_polling": meter_coordinator.adaptive_polling,
+            "last_poll_duration": meter_coordinator.last_poll_duration,
+            "streaming": meter_coordinator.streaming,
+            "stream_connected": meter_coordinator.stream_connected,
+            "fetch_plan": meter_coordinator.fetch_planner.endpoints,
+            "state_writes": meter_coordinator.state_writes,
+            "state_writes_skipped": meter_coordinator.state_writes_skipped,
+            "totals_excluded_channels": sorted(meter_coordinator.totals_excluded),
+        },
+        "system_coordinator": {
+            "last_update_success": system_coordinator.last_update_success,
+            "update_interval": system_coordinator.update_interval.total_seconds(),
+            "fetch_plan": system_coordinator.fetch_planner.endpoints,
+        },
+        "scheduler": client.scheduler.stats,
+        "latency": client.latency_stats,
+        "circuit_breaker": client.circuit_breaker.stats if client.circuit_breaker else None,
+        "fleet": meter_coordinator.fleet.stats if meter_coordinator.fleet else None,
+    }
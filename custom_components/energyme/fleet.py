@@ -0,0 +1,146 @@
+"""Fleet poller scheduling the meter polls of every EnergyMe device."""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN, FLEET_MAX_CONCURRENT_POLLS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+
+@callback
+def async_get_fleet_poller(hass: HomeAssistant) -> "FleetPoller":
+    """Return the fleet poller shared by every config entry."""
+    fleet: FleetPoller | None = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = FleetPoller(hass)
+    return fleet
+
+
+class FleetPoller:
+    """Run the polls of many coordinators from a single timer.
+
+    Instead of one timer per coordinator, the polls of each coordinator fall
+    on a grid of its own update interval, shifted by a phase: with N
+    coordinators, the k-th one polls at k/N of its interval, so devices with
+    the same interval are spread evenly over it and each keeps its interval.
+    At most `max_concurrent` polls run at once. The coordinators fan the
+    results out to their own entities, and hand their next poll back to the
+    fleet when it completes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = FLEET_MAX_CONCURRENT_POLLS,
+    ) -> None:
+        """Initialize the fleet poller."""
+        self._hass = hass
+        self._max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._epoch = time.monotonic()
+        # Coordinators of the fleet, in the order of their phase
+        self._members: list[DataUpdateCoordinator] = []
+        self._due: dict[DataUpdateCoordinator, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._running = 0
+        self._max_running = 0
+        self._polls = 0
+        self._skipped = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the schedule and counters of the fleet."""
+        now = time.monotonic()
+        return {
+            "scheduled": {
+                coordinator.name: round(due - now, 1)
+                for coordinator, due in sorted(self._due.items(), key=lambda item: item[1])
+            },
+            "running": self._running,
+            "max_running": self._max_running,
+            "max_concurrent": self._max_concurrent,
+            "polls": self._polls,
+            "skipped": self._skipped,
+        }
+
+    @callback
+    def async_schedule(self, coordinator: DataUpdateCoordinator) -> None:
+        """Schedule the next poll of a coordinator, about one interval from now."""
+        if coordinator not in self._members:
+            self._members.append(coordinator)
+        self._due.pop(coordinator, None)
+        self._due[coordinator] = self._next_due(coordinator, time.monotonic())
+        self._arm()
+
+    @callback
+    def async_unschedule(self, coordinator: DataUpdateCoordinator) -> None:
+        """Cancel the next poll of a coordinator."""
+        if self._due.pop(coordinator, None) is not None:
+            self._arm()
+
+    @callback
+    def async_remove(self, coordinator: DataUpdateCoordinator) -> None:
+        """Remove a coordinator from the fleet, the others take over its phase."""
+        self.async_unschedule(coordinator)
+        if coordinator in self._members:
+            self._members.remove(coordinator)
+
+    def _next_due(self, coordinator: DataUpdateCoordinator, now: float) -> float:
+        """Return the first point of the coordinator's grid at least half an interval away.
+
+        A poll that completes within half an interval is followed by the next
+        point of the grid, exactly one interval after the previous one; a new
+        or changed interval is joined within half an interval either way.
+        """
+        interval = coordinator.update_interval.total_seconds()
+        phase = self._members.index(coordinator) / len(self._members) * interval
+        periods = math.ceil((now + interval / 2 - self._epoch - phase) / interval)
+        return self._epoch + phase + periods * interval
+
+    def _arm(self) -> None:
+        """Wake up for the earliest scheduled poll."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._due:
+            delay = max(min(self._due.values()) - time.monotonic(), 0.0)
+            self._timer = self._hass.loop.call_later(delay, self._async_run_due)
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Start the polls that are due."""
+        self._timer = None
+        now = time.monotonic()
+        for coordinator, due in list(self._due.items()):
+            if due > now:
+                continue
+            del self._due[coordinator]
+            self._hass.async_create_background_task(
+                self._async_poll(coordinator),
+                f"{DOMAIN}_fleet_poll_{coordinator.name}",
+            )
+        self._arm()
+
+    async def _async_poll(self, coordinator: DataUpdateCoordinator) -> None:
+        """Poll a coordinator once a concurrency slot is free."""
+        async with self._semaphore:
+            if coordinator in self._due:
+                # Refreshed (or rescheduled) while waiting for a slot
+                self._skipped += 1
+                return
+            self._running += 1
+            self._max_running = max(self._max_running, self._running)
+            self._polls += 1
+            try:
+                await coordinator.async_refresh()
+            finally:
+                self._running -= 1
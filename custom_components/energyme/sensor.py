@@ -1,6 +1,8 @@
 """Platform for sensor integration."""
 import logging
 import dataclasses
+import time
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -18,13 +20,35 @@ from homeassistant.const import (
     UnitOfEnergy,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
-from homeassistant.helpers import device_registry as dr
-
-
-from .const import AUTHOR, COMPANY, DOMAIN, CONF_HOST, MODEL, SYSTEM_SENSORS
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+
+from .const import (
+    AUTHOR,
+    CHANNEL_COUNT,
+    COMPANY,
+    DOMAIN,
+    CONF_HOST,
+    ENDPOINT_CHANNEL,
+    ENDPOINT_METER_VALUES,
+    ENDPOINT_SYSTEM_INFO,
+    MODEL,
+    PHASE_COUNT,
+)
+from .coordinator import channel_device_identifier, channel_device_name, entry_device_id
+from .snapshot import (
+    ENERGY_TOTALS,
+    EnergyAccumulator,
+    MeterSnapshot,
+    metric_offset,
+    totals_channels,
+)
+from .system import SYSTEM_SENSOR_ENDPOINTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -129,7 +153,8 @@ SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
     ),
 }
 
-# System information sensors (not per-channel)
+# System information sensors (not per-channel), their values are read as
+# described in system.SYSTEM_VALUES
 SYSTEM_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
     "firmware_version": SensorEntityDescription(
         key="firmware_version",
@@ -185,6 +210,16 @@ SYSTEM_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
         icon="mdi:memory",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "psram_free_percentage": SensorEntityDescription(
+        key="psram_free_percentage",
+        name="PSRAM Free",
+        native_unit_of_measurement="%",
+        device_class=None,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
     "uptime": SensorEntityDescription(
         key="uptime",
         name="Uptime",
@@ -203,6 +238,36 @@ SYSTEM_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
         icon="mdi:harddisk",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "nvs_used_percentage": SensorEntityDescription(
+        key="nvs_used_percentage",
+        name="NVS Entries Used",
+        native_unit_of_measurement="%",
+        device_class=None,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:database",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "crash_count": SensorEntityDescription(
+        key="crash_count",
+        name="Crash Count",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-octagon-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "reset_count": SensorEntityDescription(
+        key="reset_count",
+        name="Reset Count",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:restart",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
     "update_available": SensorEntityDescription(
         key="update_available",
         name="Firmware Update Available",
@@ -214,6 +279,57 @@ SYSTEM_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
     ),
 }
 
+# Sensors derived across channels, computed once per update by the meter
+# coordinator (snapshot.derive_totals) and attached to the main device. The
+# energy totals are accumulated by their sensors (snapshot.EnergyAccumulator)
+DERIVED_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    "total_power": SensorEntityDescription(
+        key="total_power",
+        name="Total Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:home-lightning-bolt",
+    ),
+    "net_power": SensorEntityDescription(
+        key="net_power",
+        name="Net Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:transmission-tower",
+    ),
+    **{
+        f"phase_{phase}_power": SensorEntityDescription(
+            key=f"phase_{phase}_power",
+            name=f"Phase {phase} Power",
+            native_unit_of_measurement=UnitOfPower.WATT,
+            device_class=SensorDeviceClass.POWER,
+            state_class=SensorStateClass.MEASUREMENT,
+            icon="mdi:sine-wave",
+            # Only useful on three-phase installations
+            entity_registry_enabled_default=False,
+        )
+        for phase in range(1, PHASE_COUNT + 1)
+    },
+    "energy_imported": SensorEntityDescription(
+        key="energy_imported",
+        name="Total Energy Imported",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:chart-histogram",
+    ),
+    "energy_exported": SensorEntityDescription(
+        key="energy_exported",
+        name="Total Energy Exported",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:chart-histogram-outline",
+    ),
+}
+
 # Per-metric rounding
 DECIMALS_MAP: dict[str, int] = {
     "voltage": 1,
@@ -230,6 +346,75 @@ DECIMALS_MAP: dict[str, int] = {
 }
 DEFAULT_DECIMALS = 2
 
+def channel_device_info(
+    entry_id: str,
+    channel_index: int,
+    channel_label: str,
+    base_device_id: str,
+    firmware_version: str | None,
+) -> DeviceInfo:
+    """Return the device info of a channel device."""
+    device_info = DeviceInfo(
+        identifiers={channel_device_identifier(entry_id, channel_index)},
+        name=channel_device_name(channel_index, channel_label),
+        manufacturer=AUTHOR,
+        model=f"{COMPANY} - {MODEL}",
+        via_device=(DOMAIN, base_device_id),
+    )
+    if firmware_version:
+        device_info["sw_version"] = firmware_version
+    return device_info
+
+
+def main_device_id(entry: ConfigEntry, system_values: dict[str, Any]) -> str:
+    """Return the identifier of the main device of an entry.
+
+    The device ID comes with the system data, which may not be fetched yet
+    when the sensors are set up; the config flow stored the same ID as the
+    unique ID of the entry. Legacy entries wait for the system data during
+    setup, the entry ID is only used when the device has no ID at all.
+    """
+    return system_values.get("device_id") or entry_device_id(entry) or entry.entry_id
+
+
+@callback
+def _async_should_create(
+    entity_registry: er.EntityRegistry,
+    entry: ConfigEntry,
+    device_id: str,
+    *,
+    unique_id: str,
+    object_id: str,
+    name: str,
+    description: SensorEntityDescription,
+    enabled_default: bool,
+) -> bool:
+    """Return whether a sensor is enabled, registering it as disabled if it is new."""
+    entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+    if entity_id is not None:
+        return not entity_registry.async_get(entity_id).disabled
+    if enabled_default:
+        return True
+
+    # Listed as disabled, like an entity with entity_registry_enabled_default=False
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        unique_id,
+        suggested_object_id=object_id,
+        config_entry=entry,
+        device_id=device_id,
+        disabled_by=er.RegistryEntryDisabler.INTEGRATION,
+        has_entity_name=True,
+        original_name=name,
+        original_icon=description.icon,
+        original_device_class=description.device_class,
+        entity_category=description.entity_category,
+        unit_of_measurement=description.native_unit_of_measurement,
+    )
+    return False
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -244,24 +429,11 @@ async def async_setup_entry(
     if not meter_coordinator.last_update_success or not meter_coordinator.data:
         _LOGGER.warning("Meter coordinator has no data, deferring sensor setup")
 
-    if not system_coordinator.last_update_success or not system_coordinator.data:
-        _LOGGER.warning("System coordinator has no data, deferring sensor setup")
-
-    channel_configs = meter_coordinator.data.get("channels", {}) if meter_coordinator.data else {}
-    # Handle the response structure from the API
-    if isinstance(channel_configs, dict) and "channels" in channel_configs:
-        # API returns {"channels": [...]}
-        channel_configs = channel_configs["channels"]
-
-    # Normalize channel_configs to a dict keyed by index-string so downstream code can rely on .items()
-    if isinstance(channel_configs, list):
-        _LOGGER.debug("channel_configs is a list, normalizing to dict")
-        normalized = {}
-        for i, item in enumerate(channel_configs):
-            # item may itself be a dict with an 'index' field
-            key = str(item.get("index", i)) if isinstance(item, dict) else str(i)
-            normalized[key] = item
-        channel_configs = normalized
+    if not system_coordinator.data:
+        _LOGGER.debug(
+            "System data of %s not fetched yet, the system sensors are populated when it arrives",
+            entry.title,
+        )
 
     sensors = []
 
@@ -269,10 +441,9 @@ async def async_setup_entry(
     device_registry = dr.async_get(hass)
 
     # Get device info from system coordinator for main device
-    device_data = system_coordinator.data.get("device_info", {}) if system_coordinator.data else {}
-    static_info = device_data.get("static", {})
-    base_device_id = static_info.get("device", {}).get("id") or entry.entry_id
-    firmware_version = static_info.get("firmware", {}).get("buildVersion")
+    system_values = system_coordinator.data["values"] if system_coordinator.data else {}
+    base_device_id = main_device_id(entry, system_values)
+    firmware_version = system_values.get("firmware_version")
 
     # Get host from config entry for fallback
     config_entry = coordinators["config_entry"]
@@ -295,59 +466,224 @@ async def async_setup_entry(
     # Log that main device was created
     _LOGGER.debug("Created main device: %s with ID: %s", main_device.name, main_device.id)
 
-    # Add system sensors to the main device (not channel-specific) - always enabled
+    # Only the sensors that will be enabled are instantiated: a disabled one
+    # is only recorded in the entity registry, and Home Assistant reloads the
+    # entry when it gets enabled, which creates it then.
+    entity_registry = er.async_get(hass)
+    skipped = 0
+
+    # Add system sensors to the main device (not channel-specific)
     for api_key, description in SYSTEM_SENSOR_DESCRIPTIONS.items():
-        if api_key in SYSTEM_SENSORS:  # Only create defined system sensors
-            sensors.append(
-                EnergyMeSystemSensor(
-                    coordinator=system_coordinator,
-                    entry_id=entry.entry_id,
-                    api_key=api_key,
-                    entity_description=description,
-                    main_device_id=base_device_id,
-                )
+        if not _async_should_create(
+            entity_registry,
+            entry,
+            main_device.id,
+            unique_id=f"{DOMAIN}_{entry.entry_id}_system_{api_key}",
+            object_id=f"{DOMAIN}_{entry.entry_id.lower()}_system_{api_key.lower()}",
+            name=description.name,
+            description=description,
+            enabled_default=description.entity_registry_enabled_default,
+        ):
+            skipped += 1
+            continue
+        sensors.append(
+            EnergyMeSystemSensor(
+                coordinator=system_coordinator,
+                entry_id=entry.entry_id,
+                api_key=api_key,
+                entity_description=description,
+                main_device_id=base_device_id,
             )
+        )
 
-    # Create a map of index to channel label from channel_configs for active channels
-    active_channel_labels = {}
-    for ch_index_str, ch_data in channel_configs.items():
-        if ch_data.get("active", False):
-            active_channel_labels[int(ch_index_str)] = ch_data.get("label", f"Channel {ch_index_str}")
+    # Add the sensors derived across channels to the main device
+    for api_key, description in DERIVED_SENSOR_DESCRIPTIONS.items():
+        if not _async_should_create(
+            entity_registry,
+            entry,
+            main_device.id,
+            unique_id=f"{DOMAIN}_{entry.entry_id}_total_{api_key}",
+            object_id=f"{DOMAIN}_{entry.entry_id.lower()}_total_{api_key}",
+            name=description.name,
+            description=description,
+            enabled_default=description.entity_registry_enabled_default,
+        ):
+            skipped += 1
+            continue
+        sensor_class = EnergyMeEnergyTotalSensor if api_key in ENERGY_TOTALS else EnergyMeDerivedSensor
+        sensors.append(
+            sensor_class(
+                coordinator=meter_coordinator,
+                entry_id=entry.entry_id,
+                api_key=api_key,
+                entity_description=description,
+                main_device_id=base_device_id,
+            )
+        )
 
-    # EnergyMe device supports up to 17 channels
-    # Create ALL sensors for ALL active channels, but set entity_registry_enabled_default appropriately
-    max_channels_possible = 17
+    # Map of index to channel label for the active channels
+    active_channel_labels = meter_coordinator.data.active_channels() if meter_coordinator.data else {}
 
-    for channel_index in range(max_channels_possible):
+    # EnergyMe device supports up to CHANNEL_COUNT (17) channels
+    # Create the enabled sensors of every active channel
+    for channel_index in range(CHANNEL_COUNT):
         if channel_index in active_channel_labels:
-            channel_label = active_channel_labels[channel_index]
-
-            # Create ALL sensors for this channel
-            for api_key, description in SENSOR_DESCRIPTIONS.items():
-                # Determine if this sensor should be enabled by default
-                entity_enabled_default = False
-
-                if api_key in DEFAULT_ENABLED_ALL_CHANNELS:
-                    # Enable on all channels
-                    entity_enabled_default = True
-                elif api_key in DEFAULT_ENABLED_CHANNEL_0 and channel_index == 0:
-                    # Enable only on channel 0
-                    entity_enabled_default = True
-                # All other sensors are disabled by default
-
-                sensors.append(
-                    EnergyMeSensor(
-                        coordinator=meter_coordinator,
-                        entry_id=entry.entry_id,
-                        channel_index=channel_index,
-                        channel_label=channel_label,
-                        api_key=api_key,
-                        entity_description=description,
-                        entity_enabled_default=entity_enabled_default,
-                    )
+            channel_sensors, channel_skipped = _async_create_channel_sensors(
+                entry,
+                meter_coordinator,
+                entity_registry,
+                device_registry,
+                channel_index,
+                active_channel_labels[channel_index],
+                base_device_id,
+                firmware_version,
+            )
+            sensors.extend(channel_sensors)
+            skipped += channel_skipped
+
+    _LOGGER.debug(
+        "Creating %d sensors for %s, %d disabled sensors are not instantiated",
+        len(sensors),
+        entry.title,
+        skipped,
+    )
+    async_add_entities(sensors)
+
+    # The entities are created: the endpoints the enabled ones read are all
+    # that is fetched from now on, none if every sensor of a coordinator is disabled
+    meter_coordinator.fetch_planner.async_set_planned()
+    system_coordinator.fetch_planner.async_set_planned()
+
+    # Channels activated or deactivated on the device are added and removed
+    # as the coordinator picks up the new channel configuration, without
+    # reloading the entry (and the sensors of the other channels)
+    known_channels = set(active_channel_labels)
+    config_version = meter_coordinator.channel_config_version
+
+    @callback
+    def _async_sync_channels() -> None:
+        """Add the sensors of new active channels, remove deactivated channels."""
+        nonlocal config_version
+        if config_version == meter_coordinator.channel_config_version or not meter_coordinator.data:
+            return
+        config_version = meter_coordinator.channel_config_version
+
+        active = {
+            index: label
+            for index, label in meter_coordinator.data.active_channels().items()
+            if 0 <= index < CHANNEL_COUNT
+        }
+        new_sensors = []
+        for channel_index in sorted(active.keys() - known_channels):
+            _LOGGER.info("Adding channel %d (%s) of %s", channel_index, active[channel_index], entry.title)
+            channel_sensors, _ = _async_create_channel_sensors(
+                entry,
+                meter_coordinator,
+                entity_registry,
+                device_registry,
+                channel_index,
+                active[channel_index],
+                base_device_id,
+                firmware_version,
+            )
+            new_sensors.extend(channel_sensors)
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+        for channel_index in sorted(known_channels - active.keys()):
+            _LOGGER.info("Removing deactivated channel %d of %s", channel_index, entry.title)
+            device = device_registry.async_get_device(
+                identifiers={channel_device_identifier(entry.entry_id, channel_index)}
+            )
+            if device is not None:
+                # Removes the device and, with it, its entities
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
                 )
 
-    async_add_entities(sensors)
+        known_channels.clear()
+        known_channels.update(active)
+
+    entry.async_on_unload(meter_coordinator.async_add_listener(_async_sync_channels))
+
+    @callback
+    def _async_sync_firmware_version() -> None:
+        """Set the firmware version of the devices when it is fetched or changes."""
+        nonlocal firmware_version
+        if not system_coordinator.data:
+            return
+        version = system_coordinator.data["values"].get("firmware_version")
+        if not version or version == firmware_version:
+            return
+        firmware_version = version
+        for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+            if device.sw_version != version:
+                device_registry.async_update_device(device.id, sw_version=version)
+
+    entry.async_on_unload(system_coordinator.async_add_listener(_async_sync_firmware_version))
+
+
+@callback
+def _async_create_channel_sensors(
+    entry: ConfigEntry,
+    meter_coordinator: DataUpdateCoordinator,
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+    channel_index: int,
+    channel_label: str,
+    base_device_id: str,
+    firmware_version: str | None,
+) -> tuple[list["EnergyMeSensor"], int]:
+    """Create the channel device and the enabled sensors of a channel.
+
+    Returns the sensors and the number of disabled sensors left out.
+    """
+    channel_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        **channel_device_info(
+            entry.entry_id, channel_index, channel_label, base_device_id, firmware_version
+        ),
+    )
+
+    sensors = []
+    skipped = 0
+    for api_key, description in SENSOR_DESCRIPTIONS.items():
+        # Determine if this sensor should be enabled by default
+        entity_enabled_default = False
+
+        if api_key in DEFAULT_ENABLED_ALL_CHANNELS:
+            # Enable on all channels
+            entity_enabled_default = True
+        elif api_key in DEFAULT_ENABLED_CHANNEL_0 and channel_index == 0:
+            # Enable only on channel 0
+            entity_enabled_default = True
+        # All other sensors are disabled by default
+
+        if not _async_should_create(
+            entity_registry,
+            entry,
+            channel_device.id,
+            unique_id=f"{DOMAIN}_{entry.entry_id}_ch{channel_index}_{api_key}",
+            object_id=f"{DOMAIN}_{entry.entry_id.lower()}_ch{channel_index}_{api_key.lower()}",
+            name=f"{channel_label} - {description.name}",
+            description=description,
+            enabled_default=entity_enabled_default,
+        ):
+            skipped += 1
+            continue
+
+        sensors.append(
+            EnergyMeSensor(
+                coordinator=meter_coordinator,
+                entry_id=entry.entry_id,
+                channel_index=channel_index,
+                channel_label=channel_label,
+                api_key=api_key,
+                entity_description=description,
+                entity_enabled_default=entity_enabled_default,
+            )
+        )
+    return sensors, skipped
 
 
 class EnergyMeSensor(CoordinatorEntity, SensorEntity):  # type: ignore[misc]
@@ -369,8 +705,22 @@ class EnergyMeSensor(CoordinatorEntity, SensorEntity):  # type: ignore[misc]
         super().__init__(coordinator)
         self._channel_index = channel_index
         self._api_key = api_key
+        self._decimals = DECIMALS_MAP.get(api_key, DEFAULT_DECIMALS)
+        self._offset = metric_offset(api_key, channel_index)
+
+        # Channel labels version of the coordinator the name is based on
+        self._labels_version = coordinator.labels_version
+
+        # Last state written to the state machine, and when
+        self._written_state: tuple | None = None
+        self._written_at = 0.0
         self._base_sensor_name = entity_description.name
 
+        # Measurements publish the statistics of the samples since their last
+        # write, when the coordinator keeps samples; counters do not
+        self._interval_stats = entity_description.state_class == SensorStateClass.MEASUREMENT
+        self._sample_since = coordinator.samples.count if coordinator.samples else 0
+
         # Construct a stable unique ID (can contain uppercase)
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_ch{channel_index}_{api_key}"
 
@@ -405,122 +755,269 @@ class EnergyMeSensor(CoordinatorEntity, SensorEntity):  # type: ignore[misc]
         # Device Info: Create separate device for each channel
         coordinators = coordinator.hass.data[DOMAIN][entry_id]
         system_coordinator = coordinators["system_coordinator"]
-        device_data = system_coordinator.data.get("device_info", {}) if system_coordinator.data else {}
+        system_values = system_coordinator.data["values"] if system_coordinator.data else {}
+        base_device_id = main_device_id(coordinators["config_entry"], system_values)
+        firmware_version = system_values.get("firmware_version")
 
-        static_info = device_data.get("static", {})
-        base_device_id = static_info.get("device", {}).get("id") or entry_id
-        firmware_version = static_info.get("firmware", {}).get("buildVersion")
+        self._attr_device_info = channel_device_info(
+            entry_id, channel_index, channel_label, base_device_id, firmware_version
+        )
 
-        channel_device_id = f"{entry_id}_ch{channel_index}"
-        device_name = f"Channel {channel_index} - {channel_label}"
+    def _update_native_value(self) -> None:
+        """Update the native value from coordinator data."""
+        if not self.coordinator.last_update_success or not self.coordinator.data:
+            self._attr_native_value = None
+            self._attr_available = False
+            return
 
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, channel_device_id)},
-            "name": device_name,
-            "manufacturer": AUTHOR,
-            "model": f"{COMPANY} - {MODEL}",
-            "via_device": (DOMAIN, base_device_id),
+        snapshot: MeterSnapshot = self.coordinator.data
+
+        # Pick up a new channel label, renamed by the coordinator (devices included)
+        if self._labels_version != self.coordinator.labels_version:
+            self._labels_version = self.coordinator.labels_version
+            label = self.coordinator.channel_labels.get(self._channel_index)
+            if label is not None:
+                self._attr_name = f"{label} - {self._base_sensor_name}"
+
+        if self._offset in snapshot.invalid:
+            # Not a number, logged when the snapshot was built
+            self._attr_native_value = None
+            self._attr_available = False
+            return
+
+        value = snapshot.value(self._offset)
+        self._attr_native_value = round(value, self._decimals) if value is not None else None
+        self._attr_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Add the meter endpoints to the fetch plan while the sensor is enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.fetch_planner.async_add_consumer(
+                (ENDPOINT_METER_VALUES, ENDPOINT_CHANNEL)
+            )
+        )
+
+    def _should_write_state(self, state: tuple, now: float) -> bool:
+        """Return True if a new state is worth writing.
+
+        The value is compared after rounding, so most polls of a slowly moving
+        energy counter write nothing. A value change must also exceed the
+        metric deadband and wait for the minimum write interval; availability
+        and name changes are written at once. With a state max age, an
+        unchanged state is still rewritten once it gets that old.
+        """
+        written = self._written_state
+        if written is None or state[1:] != written[1:]:
+            return True
+
+        coordinator = self.coordinator
+        age = now - self._written_at
+        if coordinator.state_max_age and age >= coordinator.state_max_age:
+            return True
+
+        value, written_value = state[0], written[0]
+        if value == written_value:
+            return False
+        if age < coordinator.min_write_interval:
+            return False
+        if value is None or written_value is None:
+            return True
+        return abs(value - written_value) > coordinator.deadbands.get(self._api_key, 0.0)
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing the state only on a change."""
+        self._update_native_value()
+        state = (self._attr_native_value, self.available, self._attr_name)
+        now = time.monotonic()
+        if not self._should_write_state(state, now):
+            self.coordinator.state_writes_skipped += 1
+            return
+
+        self._written_state = state
+        self._written_at = now
+        self.coordinator.state_writes += 1
+        if self._interval_stats:
+            self._update_interval_stats()
+        super()._handle_coordinator_update()
+
+    def _update_interval_stats(self) -> None:
+        """Set the statistics of the samples since the last write as attributes."""
+        samples = self.coordinator.samples
+        if samples is None:
+            self._attr_extra_state_attributes = {}
+            return
+
+        stats = samples.stats(self._offset, self._sample_since)
+        self._sample_since = samples.count
+        if stats is None:
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_extra_state_attributes = {
+            "interval_mean": round(stats["mean"], self._decimals),
+            "interval_min": round(stats["min"], self._decimals),
+            "interval_max": round(stats["max"], self._decimals),
+            "interval_last": round(stats["last"], self._decimals),
+            "interval_samples": stats["samples"],
         }
 
-        if firmware_version:
-            self._attr_device_info["sw_version"] = firmware_version
+
+class EnergyMeDerivedSensor(CoordinatorEntity, SensorEntity):  # type: ignore[misc]
+    """Representation of an EnergyMe sensor derived across channels."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        entry_id: str,
+        api_key: str,
+        entity_description: SensorEntityDescription,
+        main_device_id: str,
+    ) -> None:
+        """Initialize the derived sensor."""
+        super().__init__(coordinator)
+        self._api_key = api_key
+        self._decimals = 0 if entity_description.device_class == SensorDeviceClass.ENERGY else 1
+        self._written_state: tuple | None = None
+        self._written_at = 0.0
+
+        # Unique ID can contain uppercase characters
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_total_{api_key}"
+        # Entity ID must be lowercase for HA 2026.2+
+        self.entity_id = f"sensor.{DOMAIN}_{entry_id.lower()}_total_{api_key}"
+
+        self.entity_description = entity_description
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, main_device_id)})
+
+        self._update_native_value()
 
     def _update_native_value(self) -> None:
-        """Update the native value from coordinator data."""
+        """Update the native value from the derived series of the snapshot."""
         if not self.coordinator.last_update_success or not self.coordinator.data:
             self._attr_native_value = None
             self._attr_available = False
             return
 
-        # Update channel label if it changed on the device
-        channel_configs = self.coordinator.data.get("channels", {})
-        if isinstance(channel_configs, dict) and "channels" in channel_configs:
-            channel_configs = channel_configs["channels"]
-
-        if isinstance(channel_configs, list):
-            normalized = {}
-            for item in channel_configs:
-                idx = item.get("index") if isinstance(item, dict) else None
-                if idx is not None:
-                    normalized[str(idx)] = item
-            channel_configs = normalized
-
-        channel_data_config = channel_configs.get(str(self._channel_index), {})
-        if isinstance(channel_data_config, dict):
-            current_label = channel_data_config.get("label", f"Channel {self._channel_index}")
-
-            new_name = f"{current_label} - {self._base_sensor_name}"
-            if self._attr_name != new_name:
-                self._attr_name = new_name
-                _LOGGER.debug(
-                    "Updated friendly name for ch%d %s to: %s",
-                    self._channel_index,
-                    self._api_key,
-                    new_name
-                )
+        value = self.coordinator.data.derived.get(self._api_key)
+        self._attr_native_value = round(value, self._decimals) if value is not None else None
+        self._attr_available = value is not None
 
-            new_device_name = f"Channel {self._channel_index} - {current_label}"
-            if self._attr_device_info and self._attr_device_info.get("name") != new_device_name:
-                self._attr_device_info["name"] = new_device_name
-
-                identifiers = self._attr_device_info.get("identifiers")
-                if identifiers:
-                    device_registry = dr.async_get(self.hass)
-                    device = device_registry.async_get_device(identifiers=identifiers)
-                    if device:
-                        device_registry.async_update_device(
-                            device.id,
-                            name=new_device_name
-                        )
-                        _LOGGER.debug(
-                            "Updated device name for ch%d to: %s",
-                            self._channel_index,
-                            new_device_name
-                        )
-
-        meter_data_list = self.coordinator.data.get("meter", [])
-        if isinstance(meter_data_list, dict):
-            _LOGGER.debug("meter data is a dict, normalizing to list")
-            normalized = []
-            for k, v in meter_data_list.items():
-                try:
-                    idx = int(k)
-                except Exception:
-                    idx = None
-                if isinstance(v, dict) and "data" in v:
-                    normalized.append({"index": idx if idx is not None else 0, "data": v.get("data")})
-                else:
-                    normalized.append({"index": idx if idx is not None else 0, "data": v})
-            meter_data_list = normalized
-
-        channel_data = None
-        for item in meter_data_list:
-            if item.get("index") == self._channel_index:
-                channel_data = item.get("data")
-                break
-
-        if channel_data and self._api_key in channel_data:
-            try:
-                value = float(channel_data[self._api_key])
-                decimals = DECIMALS_MAP.get(self._api_key, DEFAULT_DECIMALS)
-                self._attr_native_value = round(value, decimals)
-                self._attr_available = True
-            except (ValueError, TypeError):
-                _LOGGER.warning(
-                    "Invalid value for %s on channel %s: %s",
-                    self._api_key,
-                    self._channel_index,
-                    channel_data[self._api_key]
-                )
-                self._attr_native_value = None
-                self._attr_available = False
-        else:
-            self._attr_native_value = None
-            self._attr_available = True
+    async def async_added_to_hass(self) -> None:
+        """Add the endpoints of the sensor to the fetch plan while it is enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.fetch_planner.async_add_consumer(
+                (ENDPOINT_METER_VALUES, ENDPOINT_CHANNEL)
+            )
+        )
 
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+        """Handle updated data from the coordinator, writing the state only on a change."""
+        self._update_native_value()
+        state = (self._attr_native_value, self.available)
+        now = time.monotonic()
+        max_age = self.coordinator.state_max_age
+        if state == self._written_state and not (max_age and now - self._written_at >= max_age):
+            self.coordinator.state_writes_skipped += 1
+            return
+
+        self._written_state = state
+        self._written_at = now
+        self.coordinator.state_writes += 1
+        super()._handle_coordinator_update()
+
+
+@dataclasses.dataclass
+class EnergyTotalExtraStoredData(ExtraStoredData):
+    """Accumulated energy total and last counter reading of each channel."""
+
+    total: float | None
+    previous: dict[int, float]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the data."""
+        return {
+            "total": self.total,
+            "previous": {str(index): value for index, value in self.previous.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> "EnergyTotalExtraStoredData | None":
+        """Initialize the stored data from a dict, None if it is not valid."""
+        try:
+            total = restored["total"]
+            return cls(
+                None if total is None else float(total),
+                {int(index): float(value) for index, value in restored["previous"].items()},
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+
+class EnergyMeEnergyTotalSensor(EnergyMeDerivedSensor, RestoreEntity):
+    """Energy total of the counted channels, accumulated from their increments.
+
+    Unlike the power series, the total is not the sum of the channel counters,
+    which would jump as channels join or leave the totals (see
+    EnergyAccumulator). The total and the last readings are restored after a
+    restart, so the energy counted by the device meanwhile is not lost.
+    """
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        entry_id: str,
+        api_key: str,
+        entity_description: SensorEntityDescription,
+        main_device_id: str,
+    ) -> None:
+        """Initialize the energy total sensor."""
+        self._accumulator = EnergyAccumulator(ENERGY_TOTALS[api_key])
+        super().__init__(coordinator, entry_id, api_key, entity_description, main_device_id)
+
+    @property
+    def extra_restore_state_data(self) -> EnergyTotalExtraStoredData:
+        """Return the accumulator state to be restored after a restart."""
+        return EnergyTotalExtraStoredData(self._accumulator.total, self._accumulator.previous)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the accumulated total, then count the current readings."""
+        await super().async_added_to_hass()
+        if (extra := await self.async_get_last_extra_data()) is not None and (
+            stored := EnergyTotalExtraStoredData.from_dict(extra.as_dict())
+        ) is not None:
+            self._accumulator.total = stored.total
+            self._accumulator.previous = stored.previous
+        self._async_accumulate()
         self._update_native_value()
+
+    @callback
+    def _async_accumulate(self) -> None:
+        """Add the increments of the counters of the current snapshot.
+
+        A snapshot restored from the cache can be older than the restored
+        readings: its counters would look reset and be counted again.
+        """
+        snapshot: MeterSnapshot | None = self.coordinator.data
+        if self.coordinator.last_update_success and snapshot and not snapshot.restored:
+            self._accumulator.update(
+                snapshot, totals_channels(snapshot, self.coordinator.totals_excluded)
+            )
+
+    def _update_native_value(self) -> None:
+        """Update the native value from the accumulated total."""
+        total = self._accumulator.total
+        if not self.coordinator.last_update_success or not self.coordinator.data or total is None:
+            self._attr_native_value = None
+            self._attr_available = False
+            return
+        self._attr_native_value = round(total, self._decimals)
+        self._attr_available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Accumulate the new readings, then handle the update as the other totals."""
+        self._async_accumulate()
         super()._handle_coordinator_update()
 
 
@@ -549,27 +1046,25 @@ class EnergyMeSystemSensor(CoordinatorEntity, SensorEntity):  # type: ignore[mis
 
         self.entity_description = entity_description
 
-        if coordinator.data:
-            device_data = coordinator.data.get("device_info", {})
-            static_info = device_data.get("static", {})
-            firmware_version = static_info.get("firmware", {}).get("buildVersion")
+        # Attached to the main device even before the system data is fetched
+        firmware_version = coordinator.data["values"].get("firmware_version") if coordinator.data else None
 
-            coordinators = coordinator.hass.data[DOMAIN][entry_id]
-            config_entry = coordinators["config_entry"]
-            host = config_entry.data.get(CONF_HOST)
+        coordinators = coordinator.hass.data[DOMAIN][entry_id]
+        config_entry = coordinators["config_entry"]
+        host = config_entry.data.get(CONF_HOST)
 
-            device_name_suffix = self._main_device_id if self._main_device_id != entry_id else host.split('.')[-1] if '.' in host else host
-            device_name = f"{COMPANY} - {MODEL} | {device_name_suffix} - System"
+        device_name_suffix = self._main_device_id if self._main_device_id != entry_id else host.split('.')[-1] if '.' in host else host
+        device_name = f"{COMPANY} - {MODEL} | {device_name_suffix} - System"
 
-            self._attr_device_info = {
-                "identifiers": {(DOMAIN, self._main_device_id)},
-                "name": device_name,
-                "manufacturer": AUTHOR,
-                "model": f"{COMPANY} - {MODEL}",
-            }
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, self._main_device_id)},
+            "name": device_name,
+            "manufacturer": AUTHOR,
+            "model": f"{COMPANY} - {MODEL}",
+        }
 
-            if firmware_version:
-                self._attr_device_info["sw_version"] = firmware_version
+        if firmware_version:
+            self._attr_device_info["sw_version"] = firmware_version
 
         self._update_native_value()
 
@@ -580,62 +1075,20 @@ class EnergyMeSystemSensor(CoordinatorEntity, SensorEntity):  # type: ignore[mis
             self._attr_available = False
             return
 
-        device_info = self.coordinator.data.get("device_info", {})
-        if not device_info:
-            self._attr_native_value = None
-            self._attr_available = False
-            return
-
-        value = None
-        if self._api_key == "firmware_version":
-            value = device_info.get("static", {}).get("firmware", {}).get("buildVersion")
-        elif self._api_key == "device_id":
-            value = device_info.get("static", {}).get("device", {}).get("id")
-        elif self._api_key == "temperature":
-            temp_value = device_info.get("dynamic", {}).get("performance", {}).get("temperatureCelsius")
-            if temp_value is not None:
-                try:
-                    import math
-                    value = math.floor(float(temp_value) * 2) / 2
-                except (ValueError, TypeError):
-                    value = temp_value
-        elif self._api_key == "wifi_rssi":
-            value = device_info.get("dynamic", {}).get("network", {}).get("wifiRssi")
-        elif self._api_key == "wifi_local_ip":
-            value = device_info.get("dynamic", {}).get("network", {}).get("wifiLocalIp")
-        elif self._api_key == "heap_free_percentage":
-            heap_info = device_info.get("dynamic", {}).get("memory", {}).get("heap", {})
-            free_percentage = heap_info.get("freePercentage")
-            if free_percentage is not None:
-                try:
-                    import math
-                    value = math.floor(float(free_percentage) * 2) / 2
-                except (ValueError, TypeError):
-                    value = free_percentage
-        elif self._api_key == "uptime":
-            uptime_seconds = device_info.get("dynamic", {}).get("time", {}).get("uptimeSeconds")
-            if uptime_seconds is not None:
-                try:
-                    value = round(float(uptime_seconds) / 86400, 1)
-                except (ValueError, TypeError):
-                    value = uptime_seconds
-        elif self._api_key == "storage_free":
-            littlefs_info = device_info.get("dynamic", {}).get("storage", {}).get("littlefs", {})
-            free_percentage = littlefs_info.get("freePercentage")
-            if free_percentage is not None:
-                try:
-                    import math
-                    value = math.floor(float(free_percentage) * 2) / 2
-                except (ValueError, TypeError):
-                    value = free_percentage
-        elif self._api_key == "update_available":
-            update_info = self.coordinator.data.get("update_info", {}) if self.coordinator.data else {}
-            is_latest = update_info.get("isLatest", True)
-            value = "No" if is_latest else "Yes"
-
+        # Evaluated once per refresh by the coordinator
+        value = self.coordinator.data["values"].get(self._api_key)
         self._attr_native_value = value
         self._attr_available = self.coordinator.last_update_success and value is not None
 
+    async def async_added_to_hass(self) -> None:
+        """Add the endpoint of the sensor to the fetch plan while it is enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.fetch_planner.async_add_consumer(
+                (SYSTEM_SENSOR_ENDPOINTS.get(self._api_key, ENDPOINT_SYSTEM_INFO),)
+            )
+        )
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._update_native_value()
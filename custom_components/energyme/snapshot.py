@@ -0,0 +1,302 @@
+"""Columnar snapshot of the meter values and channel configuration.
+
+The device answers with lists (or, on some firmware, dicts keyed by index)
+of channels, each with a dict of metrics. The coordinator decodes both
+payloads once per update into a MeterSnapshot: the meter values live in a
+single column-major `array('d')` block with one row per metric and one
+column per channel, so a poll allocates one flat array instead of a dict per
+channel, each entity reads its value at a precomputed offset, and a whole
+metric row can be processed across channels at once.
+
+The series derived across channels (totals, per-phase sums) are computed
+from those rows once per snapshot, for the derived sensors to read; the
+energy totals are accumulated from the increments of the counters instead,
+by an EnergyAccumulator. A SampleRing keeps the blocks of the last snapshots
+for the statistics of the samples between two state writes.
+"""
+
+import logging
+import math
+from array import array
+from typing import Any
+
+from .const import CHANNEL_COUNT, METER_METRICS, PHASE_COUNT
+
+_LOGGER = logging.getLogger(__name__)
+
+METRIC_ROWS: dict[str, int] = {metric: row for row, metric in enumerate(METER_METRICS)}
+
+# Template of an empty value block, copied for every snapshot
+BLOCK_SIZE = len(METER_METRICS) * CHANNEL_COUNT
+_EMPTY_BLOCK = array("d", [math.nan]) * BLOCK_SIZE
+
+
+def metric_offset(metric: str, channel: int) -> int:
+    """Return the offset of a metric of a channel in the value block."""
+    return METRIC_ROWS[metric] * CHANNEL_COUNT + channel
+
+
+def _index(value: Any, default: int | None = None) -> int | None:
+    """Return a channel index as an int, or `default` if it is not one."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_channel_config(channel_config: Any) -> dict[int, dict[str, Any]]:
+    """Return the channel configuration keyed by channel index."""
+    if isinstance(channel_config, dict) and "channels" in channel_config:
+        # API returns {"channels": [...]}
+        channel_config = channel_config["channels"]
+
+    channels: dict[int, dict[str, Any]] = {}
+    if isinstance(channel_config, dict):
+        for key, item in channel_config.items():
+            index = _index(key)
+            if index is not None and isinstance(item, dict):
+                channels[index] = item
+    elif isinstance(channel_config, list):
+        for position, item in enumerate(channel_config):
+            if isinstance(item, dict):
+                index = _index(item.get("index"), position)
+                channels[index] = item
+    return channels
+
+
+def _meter_items(meter_data: Any) -> list[tuple[int, Any]]:
+    """Return the (channel index, metrics) pairs of a meter values payload."""
+    if isinstance(meter_data, dict):
+        return [
+            (_index(key, 0), value.get("data") if isinstance(value, dict) and "data" in value else value)
+            for key, value in meter_data.items()
+        ]
+    return [
+        (_index(item.get("index"), 0), item.get("data"))
+        for item in meter_data or []
+        if isinstance(item, dict)
+    ]
+
+
+class MeterSnapshot:
+    """Meter values and channel configuration of one update.
+
+    A value missing from the payload is NaN; a value that is not a number is
+    NaN too and its offset is listed in `invalid`, so the entity reading it
+    can report itself unavailable. `restored` marks a snapshot decoded from
+    the cache at startup rather than read from the device.
+    """
+
+    __slots__ = ("channels", "derived", "invalid", "restored", "values")
+
+    def __init__(
+        self,
+        channels: dict[int, dict[str, Any]] | None = None,
+        values: array | None = None,
+        invalid: frozenset[int] = frozenset(),
+    ) -> None:
+        """Initialize the snapshot."""
+        self.channels = channels if channels is not None else {}
+        self.values = values if values is not None else array("d", _EMPTY_BLOCK)
+        self.invalid = invalid
+        self.derived: dict[str, float | None] = {}
+        self.restored = False
+
+    @classmethod
+    def from_payloads(cls, channel_config: Any, meter_data: Any) -> "MeterSnapshot":
+        """Decode the raw device payloads into a snapshot."""
+        values = array("d", _EMPTY_BLOCK)
+        invalid: set[int] = set()
+        for index, data in _meter_items(meter_data):
+            if not isinstance(data, dict) or not 0 <= index < CHANNEL_COUNT:
+                continue
+            for metric, row in METRIC_ROWS.items():
+                raw = data.get(metric)
+                if raw is None:
+                    continue
+                offset = row * CHANNEL_COUNT + index
+                try:
+                    values[offset] = float(raw)
+                except (TypeError, ValueError):
+                    _LOGGER.warning(
+                        "Invalid value for %s on channel %s: %s", metric, index, raw
+                    )
+                    invalid.add(offset)
+        return cls(normalize_channel_config(channel_config), values, frozenset(invalid))
+
+    def value(self, offset: int) -> float | None:
+        """Return the value at an offset, or None if the payload had none."""
+        value = self.values[offset]
+        return None if math.isnan(value) else value
+
+    def row(self, metric: str) -> memoryview:
+        """Return the values of a metric on every channel, indexed by channel."""
+        start = METRIC_ROWS[metric] * CHANNEL_COUNT
+        return memoryview(self.values)[start:start + CHANNEL_COUNT]
+
+    def label(self, index: int) -> str:
+        """Return the label of a channel."""
+        channel = self.channels.get(index)
+        if channel is None:
+            return f"Channel {index}"
+        return channel.get("label", f"Channel {index}")
+
+    def active_channels(self) -> dict[int, str]:
+        """Return the labels of the active channels, keyed by index."""
+        return {
+            index: self.label(index)
+            for index, channel in self.channels.items()
+            if channel.get("active", False)
+        }
+
+
+# Derived energy totals and the channel counter each one accumulates
+ENERGY_TOTALS: dict[str, str] = {
+    "energy_imported": "activeEnergyImported",
+    "energy_exported": "activeEnergyExported",
+}
+
+
+def totals_channels(snapshot: MeterSnapshot, excluded: frozenset[int] = frozenset()) -> list[int]:
+    """Return the indexes of the active channels counted in the totals."""
+    return [
+        index
+        for index, channel in snapshot.channels.items()
+        if index not in excluded and channel.get("active", False) and 0 <= index < CHANNEL_COUNT
+    ]
+
+
+def derive_totals(
+    snapshot: MeterSnapshot, excluded: frozenset[int] = frozenset()
+) -> dict[str, float | None]:
+    """Return the power series derived across the active channels of a snapshot.
+
+    - `total_power`: sum of the power drawn by consuming channels
+    - `net_power`: signed sum of the active power (import minus export)
+    - `phase_<n>_power`: signed sum of the active power of the phase
+
+    A channel without a power value is left out of the sums. The energy
+    totals are not sums of the counters but accumulated, see EnergyAccumulator.
+    """
+    power = snapshot.row("activePower")
+
+    total_power = net_power = 0.0
+    phase_power: list[float | None] = [None] * PHASE_COUNT
+    for index in totals_channels(snapshot, excluded):
+        value = power[index]
+        if math.isnan(value):
+            continue
+        net_power += value
+        if value > 0:
+            total_power += value
+        phase = _index(snapshot.channels[index].get("phase"), 1) - 1
+        if 0 <= phase < PHASE_COUNT:
+            phase_power[phase] = (phase_power[phase] or 0.0) + value
+
+    derived: dict[str, float | None] = {
+        "total_power": total_power,
+        "net_power": net_power,
+    }
+    for phase, value in enumerate(phase_power, start=1):
+        derived[f"phase_{phase}_power"] = value
+    return derived
+
+
+class EnergyAccumulator:
+    """Energy total accumulated from the increments of the channel counters.
+
+    The sum of the lifetime counters of the counted channels would jump when
+    a channel is activated or deactivated, or excluded from the totals in the
+    options: the statistics read a drop as a meter reset (and count the whole
+    remaining total again) and a rise as consumption. Instead each update
+    adds the increase of every counted channel since its previous reading.
+    A channel joining the totals starts from its current counter, one leaving
+    them stops contributing, a channel without a value is added when it
+    reports again, and a counter that went backwards (reset on the device)
+    contributes its new value.
+
+    `total` starts as the sum of the counters of the first update, unless
+    restored, and `previous` holds the last reading of each counted channel.
+    """
+
+    __slots__ = ("metric", "previous", "total")
+
+    def __init__(self, metric: str) -> None:
+        """Initialize an accumulator of a counter metric."""
+        self.metric = metric
+        self.total: float | None = None
+        self.previous: dict[int, float] = {}
+
+    def update(self, snapshot: MeterSnapshot, channels: list[int]) -> None:
+        """Add the increase of the counters of `channels` since the previous update."""
+        row = snapshot.row(self.metric)
+        previous: dict[int, float] = {}
+        increase = 0.0
+        for index in channels:
+            value = row[index]
+            last = self.previous.get(index)
+            if math.isnan(value):
+                if last is not None:
+                    previous[index] = last
+                continue
+            if last is None:
+                # Joins the totals, or first reading: only the counter itself at startup
+                if self.total is None:
+                    increase += value
+            else:
+                increase += value - last if value >= last else value
+            previous[index] = value
+        self.previous = previous
+        if self.total is None:
+            if not previous:
+                return
+            self.total = 0.0
+        self.total += increase
+
+
+class SampleRing:
+    """Value blocks of the last `capacity` snapshots, in one flat array.
+
+    Appending a snapshot copies its block over the oldest one. Samples are
+    numbered from 0 in the order they were appended; `count` is the number
+    of the next one, which a reader keeps to get the samples since then.
+    """
+
+    __slots__ = ("_blocks", "capacity", "count")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring."""
+        self.capacity = capacity
+        self.count = 0
+        self._blocks = array("d", _EMPTY_BLOCK) * capacity
+
+    def append(self, snapshot: MeterSnapshot) -> None:
+        """Store the values of a snapshot."""
+        start = (self.count % self.capacity) * BLOCK_SIZE
+        self._blocks[start:start + BLOCK_SIZE] = snapshot.values
+        self.count += 1
+
+    def stats(self, offset: int, since: int) -> dict[str, float] | None:
+        """Return the statistics of a value over the samples from `since` on.
+
+        Only the samples still in the ring are counted. Returns None when
+        none of them has a value.
+        """
+        if since > self.count:
+            # Numbered by a previous ring
+            since = 0
+        blocks = self._blocks
+        values = []
+        for sample in range(max(since, self.count - self.capacity), self.count):
+            value = blocks[(sample % self.capacity) * BLOCK_SIZE + offset]
+            if not math.isnan(value):
+                values.append(value)
+        if not values:
+            return None
+        return {
+            "mean": math.fsum(values) / len(values),
+            "min": min(values),
+            "max": max(values),
+            "last": values[-1],
+            "samples": len(values),
+        }
@@ -0,0 +1,119 @@
+"""Values of the system sensors, read from the system and update info.
+
+Each value is a dotted path into the data of the system coordinator and an
+optional transform. The paths are split once, at import, and the coordinator
+evaluates every value once per refresh into a flat dict the entities read.
+The fields the client keeps from the system and update info payloads, and
+the endpoint each sensor needs, are derived from this table, so reading a
+new field of the device is a single entry here plus its entity description.
+"""
+
+import math
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import ENDPOINT_SYSTEM_INFO, ENDPOINT_UPDATE_INFO
+
+# Top-level keys of the system coordinator data, with the endpoint filling them
+PAYLOAD_ENDPOINTS = {
+    "device_info": ENDPOINT_SYSTEM_INFO,
+    "update_info": ENDPOINT_UPDATE_INFO,
+}
+
+
+def floor_half(value: Any) -> float:
+    """Round a percentage or temperature down to the half unit."""
+    return math.floor(float(value) * 2) / 2
+
+
+def seconds_to_days(value: Any) -> float:
+    """Convert an uptime in seconds to days."""
+    return round(float(value) / 86400, 1)
+
+
+def yes_if_false(value: Any) -> str:
+    """Return "Yes" when an "is latest" flag is false."""
+    return "No" if value else "Yes"
+
+
+@dataclass(frozen=True, slots=True)
+class SystemValue:
+    """A value read from a path of the system coordinator data."""
+
+    path: str
+    transform: Callable[[Any], Any] | None = None
+    # Value used when the path is missing from the payload
+    default: Any = None
+    _keys: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Split the path once."""
+        object.__setattr__(self, "_keys", tuple(self.path.split(".")))
+
+    @property
+    def endpoint(self) -> str:
+        """Return the endpoint the value is read from."""
+        return PAYLOAD_ENDPOINTS[self._keys[0]]
+
+    @property
+    def payload_field(self) -> str:
+        """Return the path of the value in its endpoint payload."""
+        return self.path.partition(".")[2]
+
+    def extract(self, data: dict[str, Any]) -> Any:
+        """Return the value, transformed, or the raw value if it cannot be."""
+        value = data
+        for key in self._keys:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if value is None:
+            value = self.default
+        if value is None or self.transform is None:
+            return value
+        try:
+            return self.transform(value)
+        except (ValueError, TypeError):
+            return value
+
+
+SYSTEM_VALUES: dict[str, SystemValue] = {
+    "firmware_version": SystemValue("device_info.static.firmware.buildVersion"),
+    "device_id": SystemValue("device_info.static.device.id"),
+    "temperature": SystemValue("device_info.dynamic.performance.temperatureCelsius", floor_half),
+    "wifi_rssi": SystemValue("device_info.dynamic.network.wifiRssi"),
+    "wifi_local_ip": SystemValue("device_info.dynamic.network.wifiLocalIp"),
+    "heap_free_percentage": SystemValue("device_info.dynamic.memory.heap.freePercentage", floor_half),
+    "psram_free_percentage": SystemValue("device_info.dynamic.memory.psram.freePercentage", floor_half),
+    "uptime": SystemValue("device_info.dynamic.time.uptimeSeconds", seconds_to_days),
+    "storage_free": SystemValue("device_info.dynamic.storage.littlefs.freePercentage", floor_half),
+    "nvs_used_percentage": SystemValue("device_info.dynamic.storage.nvs.usedEntriesPercentage", floor_half),
+    "crash_count": SystemValue("device_info.static.monitoring.crashCount"),
+    "reset_count": SystemValue("device_info.static.monitoring.resetCount"),
+    # A failed update info fetch reads as no update available
+    "update_available": SystemValue("update_info.isLatest", yes_if_false, default=True),
+}
+
+# Endpoint read by each system sensor (the fetch plan skips unused endpoints)
+SYSTEM_SENSOR_ENDPOINTS: dict[str, str] = {
+    key: value.endpoint for key, value in SYSTEM_VALUES.items()
+}
+
+# Fields of the system and update info payloads the client keeps
+SYSTEM_INFO_FIELDS = tuple(
+    value.payload_field
+    for value in SYSTEM_VALUES.values()
+    if value.endpoint == ENDPOINT_SYSTEM_INFO
+)
+UPDATE_INFO_FIELDS = tuple(
+    value.payload_field
+    for value in SYSTEM_VALUES.values()
+    if value.endpoint == ENDPOINT_UPDATE_INFO
+)
+
+
+def extract_system_values(data: dict[str, Any]) -> dict[str, Any]:
+    """Evaluate every system value on the system coordinator data."""
+    return {key: value.extract(data) for key, value in SYSTEM_VALUES.items()}
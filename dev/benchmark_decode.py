@@ -0,0 +1,90 @@
+"""Benchmark the decoding of the device responses.
+
+Decodes the payloads recorded in `payloads/` (sent compact, like the device
+does) with the standard library `json` module and with orjson, then projects
+the system and update info onto the fields the integration reads, and reports
+the time per response and the size of the tree the coordinators keep.
+
+Runs without Home Assistant; install orjson to compare both decoders:
+
+    python benchmark_decode.py --repeat 5000
+"""
+import argparse
+import importlib
+import json
+import sys
+import timeit
+import types
+from pathlib import Path
+
+DEV_PATH = Path(__file__).resolve().parent
+INTEGRATION_PATH = DEV_PATH.parent / "custom_components" / "energyme"
+
+
+def load_integration_module(name):
+    """Import a module of the integration without running the package __init__ (and Home Assistant)."""
+    if "energyme" not in sys.modules:
+        package = types.ModuleType("energyme")
+        package.__path__ = [str(INTEGRATION_PATH)]
+        sys.modules["energyme"] = package
+    return importlib.import_module(f"energyme.{name}")
+
+
+decode = load_integration_module("decode")
+system = load_integration_module("system")
+
+# Recorded payload, and the projection the client applies to it (None = kept whole)
+PAYLOADS = {
+    "system_info": decode.build_schema(system.SYSTEM_INFO_FIELDS),
+    "update_info": decode.build_schema(system.UPDATE_INFO_FIELDS),
+    "channel": None,
+    "meter_values": None,
+}
+
+
+def load_body(name):
+    """Return a recorded payload encoded the way the device sends it."""
+    data = json.loads((DEV_PATH / "payloads" / f"{name}.json").read_text())
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def deep_size(obj):
+    """Return the size of a decoded tree, containers and values included."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key) + deep_size(value) for key, value in obj.items())
+    elif isinstance(obj, list):
+        size += sum(deep_size(item) for item in obj)
+    return size
+
+
+def main():
+    """Run the benchmark and print the cost per response."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5000, help="Decodes to time per payload")
+    args = parser.parse_args()
+
+    decoders = {"json": json.loads}
+    if decode.orjson is not None:
+        decoders["orjson"] = decode.orjson.loads
+    else:
+        sys.stdout.write("orjson is not installed, only timing the json module\n")
+
+    sys.stdout.write(f"{'payload':<14}{'decoder':<10}{'bytes':>7}{'us/decode':>11}{'us/projected':>14}{'kept bytes':>16}\n")
+    for name, schema in PAYLOADS.items():
+        body = load_body(name)
+        for decoder_name, loads in decoders.items():
+            decode_us = timeit.timeit(lambda: loads(body), number=args.repeat) / args.repeat * 1e6
+            kept = deep_size(loads(body))
+            projected_us = "-"
+            if schema is not None:
+                seconds = timeit.timeit(
+                    lambda: decode.project(loads(body), schema), number=args.repeat
+                )
+                projected_us = f"{seconds / args.repeat * 1e6:.1f}"
+                kept = f"{kept} -> {deep_size(decode.project(loads(body), schema))}"
+            sys.stdout.write(f"{name:<14}{decoder_name:<10}{len(body):>7}{decode_us:>11.1f}{projected_us:>14}{kept!s:>16}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Benchmark the entity layer: memory per entity and CPU per coordinator update.
+
+Sets up the sensor platform of a full 17-channel device, through
+`sensor.async_setup_entry` like Home Assistant does, on a headless Home
+Assistant from the test harness, without a device. Only the sensors enabled
+by default are instantiated, the others are only recorded in the entity
+registry. Synthetic coordinator updates are then pushed through every
+entity (channel, derived and energy total sensors), and the script reports:
+
+- bytes allocated per entity (tracemalloc), entity objects, registry entries
+  and initial states included
+- microseconds per meter update, state writes of every meter sensor included
+
+When `benchmark_entities_baseline.json` exists, the results are compared to
+it and the script exits with status 1 when one of them regresses by more
+than the tolerance. The baseline depends on the machine, so none is
+committed: record one with `--update-baseline` before changing the code.
+
+Needs Home Assistant and its test harness (the `test` extra):
+
+    pip install pytest-homeassistant-custom-component
+    python benchmark_entities.py --updates 500
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+DEV_PATH = Path(__file__).resolve().parent
+sys.path.insert(0, str(DEV_PATH.parent))
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.energyme.api import (  # noqa: E402
+    SYSTEM_INFO_SCHEMA,
+    EnergyMeClient,
+    async_create_device_session,
+)
+from custom_components.energyme.const import (  # noqa: E402
+    CHANNEL_COUNT,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DOMAIN,
+    METER_METRICS,
+)
+from custom_components.energyme.coordinator import (  # noqa: E402
+    EnergyMeMeterCoordinator,
+    EnergyMeSystemCoordinator,
+)
+from custom_components.energyme import sensor  # noqa: E402
+from custom_components.energyme.decode import project  # noqa: E402
+from custom_components.energyme.snapshot import MeterSnapshot  # noqa: E402
+from custom_components.energyme.system import extract_system_values  # noqa: E402
+
+BASELINE_PATH = DEV_PATH / "benchmark_entities_baseline.json"
+ENTRY_ID = "01BENCHMARKENTRY0000000000"
+HOST = "192.0.2.1"  # Documentation address, never contacted
+
+CHANNEL_CONFIG = [
+    {"index": i, "label": f"Channel {i}", "active": True, "phase": 1 + i % 3}
+    for i in range(CHANNEL_COUNT)
+]
+
+
+def meter_snapshot() -> MeterSnapshot:
+    """Return a snapshot with new random values on every channel."""
+    meter = [
+        {
+            "index": i,
+            "label": f"Channel {i}",
+            "phase": 1 + i % 3,
+            "data": {metric: random.uniform(0, 5000) for metric in METER_METRICS},
+        }
+        for i in range(CHANNEL_COUNT)
+    ]
+    return MeterSnapshot.from_payloads(CHANNEL_CONFIG, meter)
+
+
+def system_data() -> dict:
+    """Return system coordinator data built from the recorded system info."""
+    device_info = json.loads((DEV_PATH / "payloads" / "system_info.json").read_text())
+    data = {"device_info": project(device_info, SYSTEM_INFO_SCHEMA), "update_info": {"isLatest": True}}
+    data["values"] = extract_system_values(data)
+    return data
+
+
+async def async_run(updates: int) -> dict[str, float]:
+    """Build the device, drive the updates and return the measurements."""
+    async with async_test_home_assistant() as hass:
+        # Load the integration from custom_components/, for its translations
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            entry_id=ENTRY_ID,
+            title="EnergyMe benchmark",
+            data={CONF_HOST: HOST, CONF_USERNAME: "admin", CONF_PASSWORD: "energyme"},
+        )
+        entry.add_to_hass(hass)
+
+        client = EnergyMeClient(async_create_device_session(hass), HOST, "admin", "energyme")
+        meter_coordinator = EnergyMeMeterCoordinator(hass, entry, client)
+        system_coordinator = EnergyMeSystemCoordinator(hass, entry, client)
+        # Updates are pushed by the benchmark, the coordinators never poll
+        meter_coordinator.update_interval = None
+        system_coordinator.update_interval = None
+        hass.data[DOMAIN] = {
+            entry.entry_id: {
+                "client": client,
+                "meter_coordinator": meter_coordinator,
+                "system_coordinator": system_coordinator,
+                "config_entry": entry,
+            }
+        }
+        meter_coordinator.async_set_updated_data(meter_snapshot())
+        system_coordinator.async_set_updated_data(system_data())
+
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="sensor",
+            platform_name=DOMAIN,
+            platform=sensor,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+
+        tracemalloc.start()
+        await platform.async_setup_entry(entry)
+        await hass.async_block_till_done()
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        entities = list(platform.entities.values())
+        registered = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+        meter_entities = sum(entity.coordinator is meter_coordinator for entity in entities)
+
+        snapshots = [meter_snapshot() for _ in range(updates)]
+        start = time.perf_counter()
+        for snapshot in snapshots:
+            meter_coordinator.async_set_updated_data(snapshot)
+            await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+
+        results = {
+            "entities": len(entities),
+            "registered": registered,
+            "bytes_per_entity": allocated / len(entities),
+            "us_per_update": elapsed / updates * 1e6,
+            "us_per_entity_update": elapsed / updates / meter_entities * 1e6,
+            "state_writes": meter_coordinator.state_writes,
+            "state_writes_skipped": meter_coordinator.state_writes_skipped,
+        }
+        await platform.async_reset()
+        return results
+
+
+def main() -> int:
+    """Run the benchmark, compare it to the baseline and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=500, help="Meter coordinator updates to drive")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed regression over the baseline (0.25 = 25%%)"
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    random.seed(0)
+    results = asyncio.run(async_run(args.updates))
+    sys.stdout.write(
+        f"{results['entities']} entities ({results['registered']} registered), {args.updates} updates\n"
+        f"bytes/entity          {results['bytes_per_entity']:10.0f}\n"
+        f"us/update             {results['us_per_update']:10.1f}\n"
+        f"us/entity update      {results['us_per_entity_update']:10.2f}\n"
+        f"state writes          {results['state_writes']:10d} ({results['state_writes_skipped']} skipped)\n"
+    )
+
+    if args.update_baseline:
+        baseline = {key: round(results[key], 1) for key in ("bytes_per_entity", "us_per_update")}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        sys.stdout.write(f"Baseline stored in {BASELINE_PATH.name}\n")
+        return 0
+    if not BASELINE_PATH.exists():
+        sys.stdout.write(f"No {BASELINE_PATH.name} to compare to, record one with --update-baseline\n")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    status = 0
+    for key, reference in baseline.items():
+        limit = reference * (1 + args.tolerance)
+        if results[key] > limit:
+            sys.stdout.write(f"REGRESSION: {key} {results[key]:.1f} > {limit:.1f} (baseline {reference})\n")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Benchmark the import time of the integration.
+
+Home Assistant imports the integration package together with its config flow
+and diagnostics platforms when the integration is loaded, which the config
+flow also does on every zeroconf discovery of a device. The HTTP client, the
+coordinators and the cache are only imported when an entry is set up. This
+script measures both steps with `python -X importtime`, each in a fresh
+interpreter that has already imported the Home Assistant modules the
+integration uses (they are loaded by Home Assistant itself anyway), so only
+the cost added by the integration is counted:
+
+- preload: `custom_components.energyme`, `.config_flow` and `.diagnostics`
+- setup: the sensor platform, which pulls in everything an entry runs on
+
+It exits with status 1 when the preload imports one of the modules deferred
+to the setup; tests/test_imports.py runs the same check. The import times
+depend on the machine, so no baseline is committed: when
+`benchmark_import_baseline.json` exists (record one with
+`--update-baseline`), a step that regresses by more than the tolerance
+over it fails too.
+
+Needs Home Assistant:
+
+    pip install homeassistant
+    python benchmark_import.py --repeat 7
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DEV_PATH = Path(__file__).resolve().parent
+REPO_PATH = DEV_PATH.parent
+BASELINE_PATH = DEV_PATH / "benchmark_import_baseline.json"
+
+PACKAGE = "custom_components.energyme"
+
+# Imported by Home Assistant before any integration is loaded
+PRELUDE = (
+    "voluptuous",
+    "aiohttp",
+    "homeassistant.config_entries",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.importlib",
+    "homeassistant.helpers.json",
+    "homeassistant.helpers.service_info.zeroconf",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+
+STEPS = {
+    "preload": (PACKAGE, f"{PACKAGE}.config_flow", f"{PACKAGE}.diagnostics"),
+    "setup": (f"{PACKAGE}.sensor",),
+}
+
+# Must not be imported before an entry is set up
+DEFERRED_MODULES = frozenset(
+    f"{PACKAGE}.{module}"
+    for module in ("api", "cache", "coordinator", "decode", "fleet", "snapshot", "system")
+)
+
+
+def parse_importtime(output: str) -> tuple[int, list[str]]:
+    """Return the cumulative time (us) of the top-level imports and every module imported.
+
+    Each line of `-X importtime` reads `import time: self | cumulative | name`,
+    with the name indented by two spaces per nesting level.
+    """
+    cumulative = 0
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit():
+            # Header line
+            continue
+        name = name[1:]
+        module = name.strip()
+        modules.append(module)
+        if len(name) == len(module):
+            cumulative += int(cumulative_us)
+    return cumulative, modules
+
+
+def measure(step: str) -> tuple[int, list[str]]:
+    """Import the modules of a step in a fresh interpreter and parse its import times."""
+    prelude = "".join(f"import {module}\n" for module in PRELUDE)
+    # Marks the end of the prelude, whose import times are not counted
+    code = f"{prelude}import sys\nsys.stderr.write('--- prelude done\\n')\n"
+    code += "".join(f"import {module}\n" for module in STEPS[step])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_PATH,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        sys.exit(f"Importing the {step} modules failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr.split("--- prelude done\n", 1)[1])
+
+
+def main() -> int:
+    """Run the benchmark, check the deferred imports and compare it to the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Fresh interpreters per step (the median is kept)")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed regression over the baseline (0.5 = 50%%)"
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    status = 0
+    results = {}
+    for step in STEPS:
+        # The first run also writes the bytecode caches
+        _, modules = measure(step)
+        results[step] = statistics.median(measure(step)[0] for _ in range(args.repeat))
+        integration_modules = [module for module in modules if module.startswith(PACKAGE)]
+        sys.stdout.write(f"{step:<8} {results[step] / 1000:8.2f} ms  {', '.join(integration_modules)}\n")
+
+        if step == "preload":
+            for module in sorted(DEFERRED_MODULES.intersection(modules)):
+                sys.stdout.write(f"REGRESSION: {module} is imported before an entry is set up\n")
+                status = 1
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({step: round(us) for step, us in results.items()}, indent=2) + "\n")
+        sys.stdout.write(f"Baseline stored in {BASELINE_PATH.name}\n")
+        return status
+    if not BASELINE_PATH.exists():
+        sys.stdout.write(f"No {BASELINE_PATH.name} to compare the times to, record one with --update-baseline\n")
+        return status
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    for step, reference in baseline.items():
+        limit = reference * (1 + args.tolerance)
+        if results[step] > limit:
+            sys.stdout.write(f"REGRESSION: {step} {results[step]:.0f} us > {limit:.0f} us (baseline {reference} us)\n")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
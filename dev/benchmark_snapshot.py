@@ -0,0 +1,137 @@
+"""Benchmark the per-update cost of reading meter values in the entities.
+
+Compares the old entity code, where each of the 187 sensors (17 channels x
+11 metrics) normalized the whole channel and meter payloads and scanned the
+meter list for its channel, with the columnar MeterSnapshot decoded once per
+update by the coordinator and read at a precomputed offset by each sensor.
+
+Runs without Home Assistant:
+
+    python benchmark_snapshot.py --updates 2000
+"""
+import argparse
+import importlib
+import random
+import sys
+import timeit
+import types
+from pathlib import Path
+
+INTEGRATION_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "energyme"
+
+
+def load_snapshot_module():
+    """Import snapshot.py without running the package __init__ (and Home Assistant)."""
+    package = types.ModuleType("energyme")
+    package.__path__ = [str(INTEGRATION_PATH)]
+    sys.modules["energyme"] = package
+    return importlib.import_module("energyme.snapshot")
+
+
+snapshot_module = load_snapshot_module()
+CHANNEL_COUNT = snapshot_module.CHANNEL_COUNT
+METRICS = list(snapshot_module.METER_METRICS)
+
+
+def build_payloads():
+    """Return a channel configuration and meter values payload like the device's."""
+    channels = {
+        "channels": [
+            {"index": i, "label": f"Channel {i}", "active": True, "phase": 1}
+            for i in range(CHANNEL_COUNT)
+        ]
+    }
+    meter = [
+        {
+            "index": i,
+            "label": f"Channel {i}",
+            "phase": 1,
+            "data": {metric: random.uniform(0, 5000) for metric in METRICS},
+        }
+        for i in range(CHANNEL_COUNT)
+    ]
+    return channels, meter
+
+
+def legacy_entity_value(data, channel_index, api_key):
+    """Read one value the way EnergyMeSensor._update_native_value used to."""
+    channel_configs = data.get("channels", {})
+    if isinstance(channel_configs, dict) and "channels" in channel_configs:
+        channel_configs = channel_configs["channels"]
+
+    if isinstance(channel_configs, list):
+        normalized = {}
+        for item in channel_configs:
+            idx = item.get("index") if isinstance(item, dict) else None
+            if idx is not None:
+                normalized[str(idx)] = item
+        channel_configs = normalized
+
+    channel_data_config = channel_configs.get(str(channel_index), {})
+    label = channel_data_config.get("label", f"Channel {channel_index}")
+
+    meter_data_list = data.get("meter", [])
+    channel_data = None
+    for item in meter_data_list:
+        if item.get("index") == channel_index:
+            channel_data = item.get("data")
+            break
+
+    if channel_data and api_key in channel_data:
+        return label, round(float(channel_data[api_key]), 2)
+    return label, None
+
+
+def legacy_update(channels, meter):
+    """Run one coordinator update through every entity, old style."""
+    data = {"channels": channels, "meter": meter}
+    for channel_index in range(CHANNEL_COUNT):
+        for api_key in METRICS:
+            legacy_entity_value(data, channel_index, api_key)
+
+
+def snapshot_update(channels, meter, offsets):
+    """Run one coordinator update through every entity, with a snapshot."""
+    snapshot = snapshot_module.MeterSnapshot.from_payloads(channels, meter)
+    for channel_index, offset in offsets:
+        label = snapshot.label(channel_index)
+        if offset in snapshot.invalid:
+            continue
+        value = snapshot.value(offset)
+        if value is not None:
+            value = round(value, 2)
+        (label, value)
+
+
+def main():
+    """Run the benchmark and print the per-update cost."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000, help="Coordinator updates to time")
+    args = parser.parse_args()
+
+    channels, meter = build_payloads()
+    # Each sensor computes its offset once, when it is created
+    offsets = [
+        (channel_index, snapshot_module.metric_offset(api_key, channel_index))
+        for channel_index in range(CHANNEL_COUNT)
+        for api_key in METRICS
+    ]
+
+    results = {
+        "before (per-entity normalization)": timeit.timeit(
+            lambda: legacy_update(channels, meter), number=args.updates
+        ),
+        "after (snapshot per update)": timeit.timeit(
+            lambda: snapshot_update(channels, meter, offsets), number=args.updates
+        ),
+    }
+
+    entities = CHANNEL_COUNT * len(METRICS)
+    sys.stdout.write(f"{entities} entities, {args.updates} updates\n")
+    for name, seconds in results.items():
+        per_update_us = seconds / args.updates * 1e6
+        sys.stdout.write(f"{name:<36} {per_update_us:9.1f} us/update {per_update_us / entities:7.2f} us/entity\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,118 @@
 """Mock server for EnergyMe device API endpoints.
 
 This server provides mock responses for development and testing of the EnergyMe Home Assistant integration.
+
+Run with `--digest-auth` to enforce HTTP digest authentication like the real
+device does. Request, challenge and stale-nonce counters are exposed on
+`/api/v1/mock/stats` (send a DELETE to reset them) so the number of round
+trips the integration makes can be counted.
 """
+import argparse
+import hashlib
+import json
+import os
 import time
-from flask import Flask, jsonify, request
+from urllib.request import parse_http_list, parse_keqv_list
+
+from flask import Flask, Response, jsonify, request, stream_with_context
 import numpy as np
 
 app = Flask(__name__)
 
+# --- Digest authentication (optional) ---
+
+DIGEST_REALM = "EnergyMe"
+
+auth_config = {
+    "enabled": False,
+    "username": "admin",
+    "password": "energyme",
+    "nonce_lifetime": 300,  # Seconds before a nonce is answered with stale=true
+}
+
+# nonce -> issue time, and the (nonce, nc) pairs already used (replay protection)
+issued_nonces: dict[str, float] = {}
+used_nonce_counts: set[tuple[str, str]] = set()
+
+stats = {
+    "requests": 0,
+    "authorized": 0,
+    "challenges": 0,
+    "staleNonces": 0,
+    "rejected": 0,
+}
+
+
+def _md5(value: str) -> str:
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def _digest_challenge(stale: bool = False):
+    """Return a 401 response carrying a fresh digest challenge."""
+    nonce = os.urandom(16).hex()
+    issued_nonces[nonce] = time.monotonic()
+    header = f'Digest realm="{DIGEST_REALM}", qop="auth", nonce="{nonce}", opaque="{_md5(DIGEST_REALM)}"'
+    if stale:
+        header += ", stale=true"
+    response = jsonify({"error": "Unauthorized"})
+    response.status_code = 401
+    response.headers["WWW-Authenticate"] = header
+    return response
+
+
+def _check_digest():
+    """Validate the Authorization header, return None if the request may proceed."""
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.startswith("Digest "):
+        stats["challenges"] += 1
+        return _digest_challenge()
+
+    params = parse_keqv_list(parse_http_list(authorization[len("Digest "):]))
+    nonce = params.get("nonce", "")
+    nonce_count = params.get("nc", "")
+
+    ha1 = _md5(f"{auth_config['username']}:{DIGEST_REALM}:{auth_config['password']}")
+    ha2 = _md5(f"{request.method}:{params.get('uri', '')}")
+    expected = _md5(f"{ha1}:{nonce}:{nonce_count}:{params.get('cnonce', '')}:auth:{ha2}")
+    if params.get("username") != auth_config["username"] or params.get("response") != expected:
+        stats["rejected"] += 1
+        return _digest_challenge()
+
+    issued_at = issued_nonces.get(nonce)
+    if (
+        issued_at is None
+        or time.monotonic() - issued_at > auth_config["nonce_lifetime"]
+        or (nonce, nonce_count) in used_nonce_counts
+    ):
+        # Valid credentials on an expired, unknown or replayed nonce
+        stats["staleNonces"] += 1
+        issued_nonces.pop(nonce, None)
+        return _digest_challenge(stale=True)
+
+    used_nonce_counts.add((nonce, nonce_count))
+    stats["authorized"] += 1
+    return None
+
+
+@app.before_request
+def enforce_digest_auth():
+    """Count every request and enforce digest authentication when enabled."""
+    if request.path == '/api/v1/mock/stats':
+        return None
+    stats["requests"] += 1
+    if not auth_config["enabled"]:
+        return None
+    return _check_digest()
+
+
+@app.route('/api/v1/mock/stats', methods=['GET', 'DELETE'])
+def mock_stats():
+    """Get or reset the request counters of the mock server."""
+    if request.method == 'DELETE':
+        for key in stats:
+            stats[key] = 0
+    return jsonify(stats)
+
 # --- System Endpoints ---
 
 @app.route('/api/v1/health', methods=['GET'])
@@ -258,49 +363,81 @@ def ade7953_register():
         return jsonify({"success": True, "message": "Register written successfully."})
 
 
+def get_single_meter_values(channel_index):
+    """Generate meter values for a single channel."""
+    return {
+        "voltage": 230.5 + (channel_index * 0.1) + np.random.normal(0, 1),  # Slight variation per channel and randomness
+        "current": 5.2 + (channel_index * 0.2) + np.random.normal(0, 0.1),
+        "activePower": 1198.6 + (channel_index * 10) + np.random.normal(0, 5),
+        "reactivePower": 120.3 + (channel_index * 2) + np.random.normal(0, 2),
+        "apparentPower": 1204.8 + (channel_index * 10.1) + np.random.normal(0, 5),
+        "powerFactor": 0.99 - (channel_index * 0.001) + np.random.normal(0, 0.005),
+        "activeEnergyImported": 1234.56 + (channel_index * 100) + np.random.normal(0, 10),
+        "activeEnergyExported": 12.34 + (channel_index * 1) + np.random.normal(0, 1),
+        "reactiveEnergyImported": 567.89 + (channel_index * 50) + np.random.normal(0, 5),
+        "reactiveEnergyExported": 5.67 + (channel_index * 0.5) + np.random.normal(0, 0.5),
+        "apparentEnergy": 1235.67 + (channel_index * 100.1) + np.random.normal(0, 10)
+    }
+
+
+def get_all_meter_values():
+    """Generate meter values for all active channels, following the C++ structure."""
+    result = []
+    CHANNEL_COUNT = 17  # Maximum number of channels
+
+    for i in range(CHANNEL_COUNT):
+        # Simulate some channels being active and having valid measurements
+        # For testing, let's make channels 0-2 active
+        if i < 3:  # Only first 3 channels are active for testing
+            channel_data = {
+                "index": i,
+                "label": f"Channel {i}",
+                "phase": 1,
+                "data": get_single_meter_values(i)
+            }
+            result.append(channel_data)
+
+    return result
+
+
 @app.route('/api/v1/ade7953/meter-values', methods=['GET'])
 def get_meter_values():
     """Get real-time meter values."""
     index = request.args.get('index')
 
-    def get_single_meter_values(channel_index):
-        """Generate meter values for a single channel."""
-        return {
-            "voltage": 230.5 + (channel_index * 0.1) + np.random.normal(0, 1),  # Slight variation per channel and randomness
-            "current": 5.2 + (channel_index * 0.2) + np.random.normal(0, 0.1),
-            "activePower": 1198.6 + (channel_index * 10) + np.random.normal(0, 5),
-            "reactivePower": 120.3 + (channel_index * 2) + np.random.normal(0, 2),
-            "apparentPower": 1204.8 + (channel_index * 10.1) + np.random.normal(0, 5),
-            "powerFactor": 0.99 - (channel_index * 0.001) + np.random.normal(0, 0.005),
-            "activeEnergyImported": 1234.56 + (channel_index * 100) + np.random.normal(0, 10),
-            "activeEnergyExported": 12.34 + (channel_index * 1) + np.random.normal(0, 1),
-            "reactiveEnergyImported": 567.89 + (channel_index * 50) + np.random.normal(0, 5),
-            "reactiveEnergyExported": 5.67 + (channel_index * 0.5) + np.random.normal(0, 0.5),
-            "apparentEnergy": 1235.67 + (channel_index * 100.1) + np.random.normal(0, 10)
-        }
-
     if index is not None:
         # Return data for a specific channel
         channel_index = int(index)
         return jsonify(get_single_meter_values(channel_index))
     else:
-        # Return data for all active channels, following the C++ structure
-        result = []
-        CHANNEL_COUNT = 17  # Maximum number of channels
-
-        for i in range(CHANNEL_COUNT):
-            # Simulate some channels being active and having valid measurements
-            # For testing, let's make channels 0-2 active
-            if i < 3:  # Only first 3 channels are active for testing
-                channel_data = {
-                    "index": i,
-                    "label": f"Channel {i}",
-                    "phase": 1,
-                    "data": get_single_meter_values(i)
-                }
-                result.append(channel_data)
+        # Return data for all active channels
+        return jsonify(get_all_meter_values())
+
+
+@app.route('/api/v1/ade7953/meter-values/stream', methods=['GET'])
+def stream_meter_values():
+    """Stream the meter values of all active channels as server-sent events.
+
+    Query parameters: `interval` (seconds between events, default 1) and
+    `count` (close the stream after this many events, default unlimited) to
+    exercise the integration's fallback to polling.
+    """
+    interval = float(request.args.get('interval', 1))
+    count = request.args.get('count')
+    count = int(count) if count is not None else None
+
+    def generate():
+        sent = 0
+        while count is None or sent < count:
+            yield f"data: {json.dumps(get_all_meter_values())}\n\n"
+            sent += 1
+            time.sleep(interval)
 
-        return jsonify(result)
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.route('/api/v1/ade7953/grid-frequency', methods=['GET'])
@@ -321,4 +458,24 @@ def set_energy_values():
     return jsonify({"success": True, "message": "Energy values updated."})
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    parser = argparse.ArgumentParser(description="EnergyMe device API mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--digest-auth", action="store_true", help="Enforce HTTP digest authentication")
+    parser.add_argument("--username", default=auth_config["username"])
+    parser.add_argument("--password", default=auth_config["password"])
+    parser.add_argument(
+        "--nonce-lifetime",
+        type=int,
+        default=auth_config["nonce_lifetime"],
+        help="Seconds before a nonce is reported as stale",
+    )
+    args = parser.parse_args()
+
+    auth_config.update(
+        enabled=args.digest_auth,
+        username=args.username,
+        password=args.password,
+        nonce_lifetime=args.nonce_lifetime,
+    )
+    app.run(host=args.host, port=args.port, debug=True)
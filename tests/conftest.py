@@ -0,0 +1,140 @@
+"""Fixtures of the EnergyMe integration tests."""
+
+import copy
+import threading
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from werkzeug.serving import make_server
+
+import mock_server
+
+from custom_components.energyme.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from custom_components.energyme.coordinator import (
+    EnergyMeMeterCoordinator,
+    EnergyMeSystemCoordinator,
+)
+
+CHANNEL_COUNT = 3
+
+
+@pytest.fixture(autouse=True)
+def threaded_resolver(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give the sessions of Home Assistant the threaded resolver, see `session`."""
+    monkeypatch.setattr(aiohttp_client, "AsyncResolver", aiohttp.ThreadedResolver)
+
+
+@pytest.fixture
+def mock_device(socket_enabled: None) -> Iterator[str]:
+    """Run the mock server of dev/ with digest authentication, return its host."""
+    mock_server.auth_config.update(enabled=True, nonce_lifetime=300)
+    mock_server.issued_nonces.clear()
+    mock_server.used_nonce_counts.clear()
+    for key in mock_server.stats:
+        mock_server.stats[key] = 0
+
+    server = make_server("127.0.0.1", 0, mock_server.app)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+    mock_server.auth_config["enabled"] = False
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Return a session keeping one connection per host, like the integration's.
+
+    The threaded resolver does not start the thread of the asynchronous one,
+    which outlives the test, and is never used for the IP address of the mock.
+    """
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=1, resolver=aiohttp.ThreadedResolver())
+    ) as session:
+        yield session
+
+
+class FakeDevice:
+    """Stand in for the EnergyMeClient of a device, counting the requests."""
+
+    def __init__(self, host: str = "192.0.2.1") -> None:
+        """Initialize a device with every channel active and reporting."""
+        self.host = host
+        self.requests: Counter[str] = Counter()
+        self.channel_config = [
+            {"index": index, "label": f"Channel {index}", "active": True, "phase": 1}
+            for index in range(CHANNEL_COUNT)
+        ]
+        self.meter_values = [
+            {
+                "index": index,
+                "label": f"Channel {index}",
+                "data": {"activePower": 100.0, "activeEnergyImported": 1000.0},
+            }
+            for index in range(CHANNEL_COUNT)
+        ]
+
+    async def async_get_channel_config(self) -> Any:
+        """Return the channel configuration."""
+        self.requests["channel"] += 1
+        return copy.deepcopy(self.channel_config)
+
+    async def async_get_meter_values(self) -> Any:
+        """Return the meter values."""
+        self.requests["meter"] += 1
+        return copy.deepcopy(self.meter_values)
+
+    async def async_get_system_info(self, priority: Any = None) -> dict[str, Any]:
+        """Return the system info."""
+        self.requests["system"] += 1
+        return {"static": {"device": {"id": "e8d3a1b2c3d4"}}}
+
+    async def async_get_update_info(self) -> dict[str, Any]:
+        """Return the firmware update info."""
+        self.requests["update"] += 1
+        return {"isLatest": True}
+
+
+@pytest.fixture
+def device() -> FakeDevice:
+    """Return a fake device with three active channels."""
+    return FakeDevice()
+
+
+def mock_entry(hass: HomeAssistant, host: str = "192.0.2.1", **options: Any) -> MockConfigEntry:
+    """Add and return a config entry of a device."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=f"EnergyMe {host}",
+        data={CONF_HOST: host, CONF_USERNAME: "admin", CONF_PASSWORD: "energyme"},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def meter_coordinator(
+    hass: HomeAssistant, device: FakeDevice
+) -> AsyncIterator[EnergyMeMeterCoordinator]:
+    """Return a meter coordinator of the fake device, shut down after the test."""
+    coordinator = EnergyMeMeterCoordinator(hass, mock_entry(hass), device)
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+async def system_coordinator(
+    hass: HomeAssistant, device: FakeDevice
+) -> AsyncIterator[EnergyMeSystemCoordinator]:
+    """Return a system coordinator of the fake device, shut down after the test."""
+    coordinator = EnergyMeSystemCoordinator(hass, mock_entry(hass), device)
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,125 @@
+"""Tests of the device data cache restored at startup."""
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.energyme.cache import EnergyMeCache
+from custom_components.energyme.const import CACHE_SAVE_DELAY, DOMAIN
+from custom_components.energyme.coordinator import (
+    EnergyMeMeterCoordinator,
+    EnergyMeSystemCoordinator,
+)
+
+from .conftest import FakeDevice
+
+
+async def _tracked_cache(
+    hass: HomeAssistant,
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+) -> EnergyMeCache:
+    """Return a cache saving the coordinators, once they have data."""
+    await meter_coordinator.async_refresh()
+    await system_coordinator.async_refresh()
+    cache = EnergyMeCache(hass, meter_coordinator.config_entry)
+    cache.async_track(meter_coordinator, system_coordinator)
+    return cache
+
+
+def _stored(hass_storage: dict[str, Any], coordinator: EnergyMeMeterCoordinator) -> Any:
+    return hass_storage.get(f"{DOMAIN}.{coordinator.config_entry.entry_id}", {}).get("data")
+
+
+async def test_updates_are_saved_after_the_delay(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+    device: FakeDevice,
+) -> None:
+    """The data of the coordinators is written once the save delay has passed."""
+    await _tracked_cache(hass, meter_coordinator, system_coordinator)
+    await meter_coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert _stored(hass_storage, meter_coordinator) is None
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=CACHE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert _stored(hass_storage, meter_coordinator) == {
+        "channel_config": device.channel_config,
+        "meter_values": device.meter_values,
+        "device_info": system_coordinator.data["device_info"],
+        "update_info": {"isLatest": True},
+    }
+
+
+async def test_flush_writes_the_pending_save_at_once(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+    device: FakeDevice,
+) -> None:
+    """Unloading writes the pending data, and nothing is written afterwards."""
+    cache = await _tracked_cache(hass, meter_coordinator, system_coordinator)
+    await meter_coordinator.async_refresh()
+    await cache.async_flush()
+    assert _stored(hass_storage, meter_coordinator)["meter_values"] == device.meter_values
+
+    # Updates until the listeners are removed, then the delayed write, change nothing
+    device.meter_values[0]["data"]["activePower"] = 5.0
+    await meter_coordinator.async_refresh()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=CACHE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert _stored(hass_storage, meter_coordinator)["meter_values"][0]["data"]["activePower"] == 100.0
+
+
+async def test_flush_without_pending_save_writes_nothing(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+) -> None:
+    """A cache with nothing to save is not written on unload."""
+    cache = EnergyMeCache(hass, meter_coordinator.config_entry)
+    cache.async_track(meter_coordinator, system_coordinator)
+    await cache.async_flush()
+    assert _stored(hass_storage, meter_coordinator) is None
+
+
+async def test_restore_from_the_saved_data(
+    hass: HomeAssistant,
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+    device: FakeDevice,
+) -> None:
+    """The saved data is restored into new coordinators, the meter snapshot marked as restored."""
+    cache = await _tracked_cache(hass, meter_coordinator, system_coordinator)
+    await meter_coordinator.async_refresh()
+    await cache.async_flush()
+
+    entry = meter_coordinator.config_entry
+    cached = await EnergyMeCache(hass, entry).async_load()
+    restored_meter = EnergyMeMeterCoordinator(hass, entry, device)
+    restored_system = EnergyMeSystemCoordinator(hass, entry, device)
+    restored_meter.async_restore(cached["channel_config"], cached["meter_values"])
+    restored_system.async_restore(cached["device_info"], cached["update_info"])
+
+    snapshot = restored_meter.data
+    assert snapshot.restored
+    assert not meter_coordinator.data.restored
+    assert snapshot.values.tobytes() == meter_coordinator.data.values.tobytes()
+    assert snapshot.derived == meter_coordinator.data.derived
+    assert restored_meter.channel_labels == meter_coordinator.channel_labels
+    assert restored_system.data["values"] == system_coordinator.data["values"]
+
+    # The restored configuration is re-fetched by the first poll
+    await restored_meter.async_refresh()
+    assert device.requests["channel"] == 2
+    assert not restored_meter.data.restored
+    await restored_meter.async_shutdown()
+    await restored_system.async_shutdown()
@@ -0,0 +1,90 @@
+"""Tests of the channel configuration cache of the meter coordinator."""
+
+import pytest
+
+from custom_components.energyme import coordinator as coordinator_module
+from custom_components.energyme.coordinator import EnergyMeMeterCoordinator
+
+from .conftest import FakeDevice
+
+
+@pytest.fixture(autouse=True)
+def no_min_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let every poll re-fetch the channel configuration when the meter values disagree."""
+    monkeypatch.setattr(coordinator_module, "CHANNEL_CONFIG_MIN_AGE", 0)
+
+
+async def _poll(coordinator: EnergyMeMeterCoordinator, polls: int = 1) -> None:
+    for _ in range(polls):
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+
+
+async def test_steady_polls_use_the_cached_configuration(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """Once fetched, the configuration is not requested again."""
+    await _poll(meter_coordinator, 5)
+    assert device.requests == {"channel": 1, "meter": 5}
+
+
+async def test_unknown_channel_refreshes_the_configuration(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """A channel activated on the device is picked up by the next poll."""
+    await _poll(meter_coordinator)
+    device.channel_config.append({"index": 3, "label": "Channel 3", "active": True})
+    device.meter_values.append({"index": 3, "label": "Channel 3", "data": {"activePower": 1.0}})
+
+    await _poll(meter_coordinator, 3)
+    assert device.requests["channel"] == 2
+    assert 3 in meter_coordinator.data.active_channels()
+
+
+async def test_label_change_refreshes_the_configuration(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """A renamed channel is picked up by the next poll."""
+    await _poll(meter_coordinator)
+    device.channel_config[1]["label"] = "Heat pump"
+    device.meter_values[1]["label"] = "Heat pump"
+
+    await _poll(meter_coordinator, 3)
+    assert device.requests["channel"] == 2
+    assert meter_coordinator.channel_labels[1] == "Heat pump"
+
+
+async def test_deactivated_channel_refreshes_the_configuration(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """A channel no longer reported because it was deactivated is picked up."""
+    await _poll(meter_coordinator)
+    device.channel_config[2]["active"] = False
+    del device.meter_values[2]
+
+    await _poll(meter_coordinator, 3)
+    assert device.requests["channel"] == 2
+    assert 2 not in meter_coordinator.data.active_channels()
+
+
+async def test_active_channel_without_reading_refreshes_once(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """An active channel the firmware leaves out does not defeat the cache."""
+    await _poll(meter_coordinator)
+    reading = device.meter_values.pop(2)
+
+    await _poll(meter_coordinator, 5)
+    assert device.requests["channel"] == 2
+
+    # Reported again, then left out again: already checked
+    device.meter_values.append(reading)
+    await _poll(meter_coordinator)
+    del device.meter_values[2]
+    await _poll(meter_coordinator, 3)
+    assert device.requests["channel"] == 2
+
+    # Another channel left out is checked once too
+    del device.meter_values[0]
+    await _poll(meter_coordinator, 3)
+    assert device.requests["channel"] == 3
@@ -0,0 +1,190 @@
+"""Tests of the circuit breaker suspending requests to an unreachable device."""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.energyme.api import (
+    CircuitBreaker,
+    CircuitState,
+    EnergyMeCircuitOpenError,
+    EnergyMeClient,
+    EnergyMeConnectionError,
+)
+from custom_components.energyme.const import ENDPOINT_HEALTH, ENDPOINT_METER_VALUES
+
+BACKOFF = 0.05
+# Time elapsed between opening the circuit and reading retry_in
+SLACK = 0.01
+
+
+def _tripped_breaker(threshold: int = 3) -> CircuitBreaker:
+    """Return a breaker with a short backoff, opened by consecutive failures."""
+    breaker = CircuitBreaker(failure_threshold=threshold, backoff_min=BACKOFF, backoff_max=4 * BACKOFF)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_failures() -> None:
+    """The circuit stays closed below the threshold and opens once it is reached."""
+    breaker = CircuitBreaker(failure_threshold=3, backoff_min=BACKOFF)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+    assert breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert BACKOFF / 2 - SLACK <= breaker.retry_in <= BACKOFF
+    assert breaker.stats["opened_total"] == 1
+
+
+def test_success_resets_the_failure_count() -> None:
+    """Failures only count when consecutive."""
+    breaker = CircuitBreaker(failure_threshold=2, backoff_min=BACKOFF)
+    breaker.record_failure()
+    assert not breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_backoff_doubles_up_to_the_maximum() -> None:
+    """Every failed probe doubles the delay before the next one."""
+    breaker = _tripped_breaker()
+    for delay in (2 * BACKOFF, 4 * BACKOFF, 4 * BACKOFF):
+        # A failed probe of the half-open circuit
+        assert not breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert delay / 2 - SLACK <= breaker.retry_in <= delay
+    assert breaker.stats["opened_total"] == 1
+
+
+def test_single_probe_when_half_open() -> None:
+    """Only one caller probes a half-open circuit, a success closes it."""
+    breaker = _tripped_breaker()
+    time.sleep(BACKOFF)
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    assert breaker.begin_probe()
+    assert not breaker.begin_probe()
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    assert breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.begin_probe()
+
+
+def test_abort_probe_releases_the_claim() -> None:
+    """A probe without an outcome can be claimed again."""
+    breaker = _tripped_breaker()
+    time.sleep(BACKOFF)
+    assert breaker.begin_probe()
+    breaker.abort_probe()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.begin_probe()
+
+
+class FakeDevice:
+    """Answer the client's requests without a network, optionally holding the probe."""
+
+    def __init__(self) -> None:
+        """Initialize a reachable device."""
+        self.reachable = True
+        self.requests: list[str] = []
+        self.probe_started = asyncio.Event()
+        self.release_probe = asyncio.Event()
+        self.release_probe.set()
+        self.probe_error: BaseException | None = None
+
+    async def request(self, endpoint: str, priority: object, timeout: float | None = None) -> dict:
+        """Stand in for EnergyMeClient._async_request_json."""
+        self.requests.append(endpoint)
+        if endpoint == ENDPOINT_HEALTH:
+            self.probe_started.set()
+            await self.release_probe.wait()
+            if self.probe_error is not None:
+                raise self.probe_error
+        if not self.reachable:
+            raise EnergyMeConnectionError("unreachable")
+        return {}
+
+
+@pytest.fixture
+def device(monkeypatch: pytest.MonkeyPatch) -> tuple[EnergyMeClient, FakeDevice]:
+    """Return a client with a tripped circuit breaker, talking to a fake device."""
+    client = EnergyMeClient(None, "192.0.2.1", "admin", "energyme", circuit_breaker=_tripped_breaker())
+    fake = FakeDevice()
+    monkeypatch.setattr(client, "_async_request_json", fake.request)
+    return client, fake
+
+
+async def test_open_circuit_fails_fast(device: tuple[EnergyMeClient, FakeDevice]) -> None:
+    """While open, requests fail without reaching the device."""
+    client, fake = device
+    with pytest.raises(EnergyMeCircuitOpenError):
+        await client.async_get_meter_values()
+    assert fake.requests == []
+
+
+async def test_half_open_sends_a_single_probe(device: tuple[EnergyMeClient, FakeDevice]) -> None:
+    """Concurrent callers of a half-open circuit fail fast while one probes."""
+    client, fake = device
+    await asyncio.sleep(BACKOFF)
+    fake.release_probe.clear()
+
+    probing = asyncio.create_task(client.async_get_meter_values())
+    await fake.probe_started.wait()
+    with pytest.raises(EnergyMeCircuitOpenError):
+        await client.async_get_meter_values()
+
+    fake.release_probe.set()
+    assert await probing == {}
+    assert fake.requests == [ENDPOINT_HEALTH, ENDPOINT_METER_VALUES]
+    assert client.circuit_breaker.state is CircuitState.CLOSED
+
+
+async def test_failed_probe_keeps_the_circuit_open(device: tuple[EnergyMeClient, FakeDevice]) -> None:
+    """A probe that cannot connect reopens the circuit with a longer backoff."""
+    client, fake = device
+    await asyncio.sleep(BACKOFF)
+    fake.reachable = False
+
+    with pytest.raises(EnergyMeCircuitOpenError):
+        await client.async_get_meter_values()
+    assert fake.requests == [ENDPOINT_HEALTH]
+    assert client.circuit_breaker.state is CircuitState.OPEN
+    assert client.circuit_breaker.retry_in >= BACKOFF - SLACK
+
+
+async def test_cancelled_probe_is_aborted(device: tuple[EnergyMeClient, FakeDevice]) -> None:
+    """Cancelling the probing request lets the next caller probe again."""
+    client, fake = device
+    await asyncio.sleep(BACKOFF)
+    fake.release_probe.clear()
+
+    probing = asyncio.create_task(client.async_get_meter_values())
+    await fake.probe_started.wait()
+    probing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probing
+    assert client.circuit_breaker.state is CircuitState.HALF_OPEN
+
+    fake.release_probe.set()
+    assert await client.async_get_meter_values() == {}
+    assert fake.requests == [ENDPOINT_HEALTH, ENDPOINT_HEALTH, ENDPOINT_METER_VALUES]
+
+
+async def test_probe_failing_unexpectedly_is_aborted(device: tuple[EnergyMeClient, FakeDevice]) -> None:
+    """A probe ending in an error other than a device error does not block the circuit."""
+    client, fake = device
+    await asyncio.sleep(BACKOFF)
+    fake.probe_error = RuntimeError("Session is closed")
+
+    with pytest.raises(RuntimeError):
+        await client.async_get_meter_values()
+    assert client.circuit_breaker.state is CircuitState.HALF_OPEN
+
+    fake.probe_error = None
+    assert await client.async_get_meter_values() == {}
+    assert client.circuit_breaker.state is CircuitState.CLOSED
@@ -0,0 +1,77 @@
+"""Tests of the preemptive digest authentication against the mock device."""
+
+import time
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+import mock_server
+
+from custom_components.energyme.api import EnergyMeClient, async_create_device_session
+
+
+def _client(session: aiohttp.ClientSession, host: str) -> EnergyMeClient:
+    """Return a client of the mock device with its default credentials."""
+    return EnergyMeClient(
+        session,
+        host,
+        mock_server.auth_config["username"],
+        mock_server.auth_config["password"],
+    )
+
+
+async def test_one_request_per_poll_with_cached_nonce(
+    session: aiohttp.ClientSession, mock_device: str
+) -> None:
+    """Only the first poll pays the challenge round trip."""
+    client = _client(session, mock_device)
+
+    await client.async_get_meter_values()
+    assert mock_server.stats["requests"] == 2
+    assert mock_server.stats["challenges"] == 1
+
+    for _ in range(5):
+        await client.async_get_meter_values()
+
+    assert mock_server.stats["requests"] == 7
+    assert mock_server.stats["challenges"] == 1
+    assert mock_server.stats["authorized"] == 6
+    assert mock_server.stats["staleNonces"] == 0
+
+
+async def test_stale_nonce_is_answered_once(
+    session: aiohttp.ClientSession, mock_device: str
+) -> None:
+    """An expired nonce costs a single re-challenge, then polls are preemptive again."""
+    client = _client(session, mock_device)
+    await client.async_get_meter_values()
+    await client.async_get_meter_values()
+    assert mock_server.stats["requests"] == 3
+
+    # Expire the cached nonce on the device side
+    for nonce in mock_server.issued_nonces:
+        mock_server.issued_nonces[nonce] = time.monotonic() - 3600
+
+    await client.async_get_meter_values()
+    assert mock_server.stats["requests"] == 5
+    assert mock_server.stats["staleNonces"] == 1
+
+    await client.async_get_meter_values()
+    assert mock_server.stats["requests"] == 6
+    assert mock_server.stats["challenges"] == 1
+    assert mock_server.stats["staleNonces"] == 1
+    assert mock_server.stats["rejected"] == 0
+
+
+async def test_entry_session_of_home_assistant(hass: HomeAssistant, mock_device: str) -> None:
+    """The session created by the Home Assistant helper authenticates the same way."""
+    session = async_create_device_session(hass)
+    client = _client(session, mock_device)
+    for _ in range(3):
+        assert await client.async_get_meter_values()
+    assert mock_server.stats["requests"] == 4
+    assert mock_server.stats["challenges"] == 1
+    assert client.latency_stats
+
+    await hass.async_stop()
+    assert session.closed
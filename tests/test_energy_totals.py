@@ -0,0 +1,140 @@
+"""Tests of the energy totals accumulated from the channel counters."""
+
+import math
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+
+from custom_components.energyme.sensor import (
+    EnergyMeEnergyTotalSensor,
+    EnergyTotalExtraStoredData,
+)
+from custom_components.energyme.snapshot import EnergyAccumulator, MeterSnapshot
+
+METRIC = "activeEnergyImported"
+
+
+def _snapshot(counters: dict[int, float | None], active: set[int] | None = None) -> MeterSnapshot:
+    """Return a snapshot of active channels with the given counters (None: not reported)."""
+    channel_config = [
+        {"index": index, "label": f"Channel {index}", "active": active is None or index in active}
+        for index in counters
+    ]
+    meter_values = [
+        {"index": index, "data": {} if value is None else {METRIC: value}}
+        for index, value in counters.items()
+    ]
+    return MeterSnapshot.from_payloads(channel_config, meter_values)
+
+
+def _accumulate(accumulator: EnergyAccumulator, snapshot: MeterSnapshot) -> float | None:
+    accumulator.update(snapshot, sorted(i for i, c in snapshot.channels.items() if c["active"]))
+    return accumulator.total
+
+
+def test_first_update_starts_from_the_counters() -> None:
+    """The total starts as the sum of the counters, then grows by their increments."""
+    accumulator = EnergyAccumulator(METRIC)
+    assert _accumulate(accumulator, _snapshot({0: 100.0, 1: 50.0})) == 150.0
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 52.5})) == 153.5
+    assert accumulator.previous == {0: 101.0, 1: 52.5}
+
+
+def test_no_total_before_a_reading() -> None:
+    """Without any counter value the total stays unknown."""
+    accumulator = EnergyAccumulator(METRIC)
+    assert _accumulate(accumulator, _snapshot({0: None})) is None
+    assert _accumulate(accumulator, _snapshot({0: 10.0})) == 10.0
+
+
+def test_joining_channel_starts_from_its_counter() -> None:
+    """A channel activated later only adds what it counts from then on."""
+    accumulator = EnergyAccumulator(METRIC)
+    _accumulate(accumulator, _snapshot({0: 100.0, 1: 5000.0}, active={0}))
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 5000.0})) == 101.0
+    assert _accumulate(accumulator, _snapshot({0: 102.0, 1: 5003.0})) == 105.0
+
+
+def test_leaving_channel_keeps_its_contribution() -> None:
+    """Deactivating a channel stops it from counting without lowering the total."""
+    accumulator = EnergyAccumulator(METRIC)
+    _accumulate(accumulator, _snapshot({0: 100.0, 1: 50.0}))
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 60.0}, active={0})) == 151.0
+    assert accumulator.previous == {0: 101.0}
+    # Rejoining starts from the counter again, the increase while out is not counted
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 70.0})) == 151.0
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 71.0})) == 152.0
+
+
+def test_gap_is_counted_when_the_channel_reports_again() -> None:
+    """A channel without a value keeps its last reading until the next one."""
+    accumulator = EnergyAccumulator(METRIC)
+    _accumulate(accumulator, _snapshot({0: 100.0, 1: 50.0}))
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: None})) == 151.0
+    assert accumulator.previous == {0: 101.0, 1: 50.0}
+    assert _accumulate(accumulator, _snapshot({0: 101.0, 1: 54.0})) == 155.0
+
+
+def test_counter_reset_adds_the_new_value() -> None:
+    """A counter that went backwards was reset, its new value is all new energy."""
+    accumulator = EnergyAccumulator(METRIC)
+    _accumulate(accumulator, _snapshot({0: 100.0}))
+    assert _accumulate(accumulator, _snapshot({0: 2.0})) == 102.0
+    assert _accumulate(accumulator, _snapshot({0: 3.0})) == 103.0
+
+
+def test_stored_data_round_trip() -> None:
+    """The restore data survives the JSON round trip, invalid data is dropped."""
+    stored = EnergyTotalExtraStoredData(151.0, {0: 101.0, 3: 50.0})
+    assert EnergyTotalExtraStoredData.from_dict(stored.as_dict()) == stored
+    assert EnergyTotalExtraStoredData.from_dict({"total": 1.0}) is None
+    assert EnergyTotalExtraStoredData.from_dict({"total": "x", "previous": {}}) is None
+
+
+def _sensor(snapshot: MeterSnapshot, stored: EnergyTotalExtraStoredData) -> EnergyMeEnergyTotalSensor:
+    """Return an energy total sensor restored from `stored`, on `snapshot`."""
+    coordinator: Any = SimpleNamespace(
+        data=snapshot, last_update_success=True, totals_excluded=frozenset()
+    )
+    sensor = EnergyMeEnergyTotalSensor(
+        coordinator,
+        "entry",
+        "energy_imported",
+        SensorEntityDescription(
+            key="energy_imported",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        "device",
+    )
+    sensor._accumulator.total = stored.total
+    sensor._accumulator.previous = stored.previous
+    return sensor
+
+
+def test_restored_snapshot_is_not_accumulated() -> None:
+    """A cached snapshot older than the restored readings does not count as a reset."""
+    cached = _snapshot({0: 90.0, 1: 40.0})
+    cached.restored = True
+    sensor = _sensor(cached, EnergyTotalExtraStoredData(151.0, {0: 101.0, 1: 50.0}))
+
+    sensor._async_accumulate()
+    sensor._update_native_value()
+    assert sensor.native_value == 151
+
+    sensor.coordinator.data = _snapshot({0: 102.0, 1: 52.0})
+    sensor._async_accumulate()
+    sensor._update_native_value()
+    assert sensor.native_value == 154
+
+
+def test_restored_readings_count_the_energy_while_stopped() -> None:
+    """After a restart, the first poll adds what the device counted meanwhile."""
+    sensor = _sensor(_snapshot({0: 110.0}), EnergyTotalExtraStoredData(101.0, {0: 101.0}))
+    sensor._async_accumulate()
+    assert math.isclose(sensor._accumulator.total, 110.0)
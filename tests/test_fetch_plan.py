@@ -0,0 +1,121 @@
+"""Tests of the fetch plan: only the endpoints read by enabled entities are called."""
+
+import logging
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.energyme import sensor
+from custom_components.energyme.const import (
+    DOMAIN,
+    ENDPOINT_CHANNEL,
+    ENDPOINT_METER_VALUES,
+    ENDPOINT_SYSTEM_INFO,
+    ENDPOINT_UPDATE_INFO,
+)
+from custom_components.energyme.coordinator import (
+    EnergyMeMeterCoordinator,
+    EnergyMeSystemCoordinator,
+    FetchPlanner,
+)
+
+from .conftest import FakeDevice
+
+
+def test_every_endpoint_is_needed_until_planned() -> None:
+    """Before the entities are created, nothing may be skipped."""
+    changes = []
+    planner = FetchPlanner("planner", lambda: changes.append(planner.endpoints))
+    assert planner.endpoints is None
+    assert planner.needs(ENDPOINT_UPDATE_INFO)
+
+    release = planner.async_add_consumer((ENDPOINT_SYSTEM_INFO,))
+    assert planner.needs(ENDPOINT_UPDATE_INFO)
+
+    planner.async_set_planned()
+    assert planner.needs(ENDPOINT_SYSTEM_INFO)
+    assert not planner.needs(ENDPOINT_UPDATE_INFO)
+
+    release()
+    assert not planner.needs(ENDPOINT_SYSTEM_INFO)
+    assert changes == [None, [ENDPOINT_SYSTEM_INFO], []]
+
+
+def test_endpoint_shared_by_consumers() -> None:
+    """An endpoint stays needed until its last consumer is released."""
+    planner = FetchPlanner("planner")
+    planner.async_set_planned()
+    first = planner.async_add_consumer((ENDPOINT_METER_VALUES, ENDPOINT_CHANNEL))
+    second = planner.async_add_consumer((ENDPOINT_METER_VALUES,))
+    first()
+    assert planner.endpoints == [ENDPOINT_METER_VALUES]
+    second()
+    assert planner.endpoints == []
+
+
+async def test_meter_coordinator_idle_without_consumers(
+    meter_coordinator: EnergyMeMeterCoordinator, device: FakeDevice
+) -> None:
+    """With every meter sensor disabled, polls keep the last data without a request."""
+    await meter_coordinator.async_refresh()
+    data = meter_coordinator.data
+    meter_coordinator.fetch_planner.async_set_planned()
+
+    await meter_coordinator.async_refresh()
+    assert device.requests == {"channel": 1, "meter": 1}
+    assert meter_coordinator.data is data
+
+
+async def test_system_coordinator_skips_unread_endpoints(
+    system_coordinator: EnergyMeSystemCoordinator, device: FakeDevice
+) -> None:
+    """The update info is only fetched while a sensor reads it, and carried over."""
+    await system_coordinator.async_refresh()
+    assert device.requests == {"system": 1, "update": 1}
+
+    system_coordinator.fetch_planner.async_add_consumer((ENDPOINT_SYSTEM_INFO,))
+    system_coordinator.fetch_planner.async_set_planned()
+    await system_coordinator.async_refresh()
+    assert device.requests == {"system": 2, "update": 1}
+    assert system_coordinator.data["update_info"] == {"isLatest": True}
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_platform_plans_after_adding_its_entities(
+    hass: HomeAssistant,
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+) -> None:
+    """Once the sensor platform is set up, the plan holds the endpoints of its enabled entities."""
+    await meter_coordinator.async_refresh()
+    await system_coordinator.async_refresh()
+    entry = meter_coordinator.config_entry
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            "meter_coordinator": meter_coordinator,
+            "system_coordinator": system_coordinator,
+            "config_entry": entry,
+        }
+    }
+    platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain="sensor",
+        platform_name=DOMAIN,
+        platform=sensor,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
+    assert await platform.async_setup_entry(entry)
+    await hass.async_block_till_done()
+
+    assert meter_coordinator.fetch_planner.endpoints == [ENDPOINT_CHANNEL, ENDPOINT_METER_VALUES]
+    system_endpoints = system_coordinator.fetch_planner.endpoints
+    assert system_endpoints is not None
+    assert ENDPOINT_SYSTEM_INFO in system_endpoints
+
+    await platform.async_reset()
+    assert meter_coordinator.fetch_planner.endpoints == []
+    assert not meter_coordinator.fetch_planner.needs(ENDPOINT_METER_VALUES)
@@ -0,0 +1,146 @@
+"""Tests of the fleet poller spreading the meter polls of every device."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.energyme.coordinator import EnergyMeMeterCoordinator
+from custom_components.energyme.fleet import FleetPoller
+
+from .conftest import FakeDevice, mock_entry
+
+INTERVAL = 10.0
+
+
+class FakeCoordinator:
+    """Coordinator polled by the fleet, optionally held until released."""
+
+    def __init__(self, name: str, interval: float = INTERVAL) -> None:
+        """Initialize a coordinator that refreshes at once."""
+        self.name = name
+        self.update_interval = timedelta(seconds=interval)
+        self.refreshes = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def async_refresh(self) -> None:
+        """Count the refresh, once released."""
+        await self.release.wait()
+        self.refreshes += 1
+
+
+@pytest.fixture
+def fleet(hass: HomeAssistant) -> FleetPoller:
+    """Return a fleet poller of at most two concurrent polls."""
+    return FleetPoller(hass, max_concurrent=2)
+
+
+def _phases(fleet: FleetPoller, coordinators: list[Any]) -> list[float]:
+    """Return the offset of the next poll of each coordinator on its grid."""
+    return [round((fleet._due[c] - fleet._epoch) % INTERVAL, 6) for c in coordinators]
+
+
+def _leave(fleet: FleetPoller, coordinators: list[Any]) -> None:
+    for coordinator in coordinators:
+        fleet.async_remove(coordinator)
+    assert fleet._timer is None
+
+
+async def test_phases_spread_the_fleet_over_the_interval(fleet: FleetPoller) -> None:
+    """The k-th of N coordinators polls at k/N of the interval, as devices join and leave."""
+    coordinators = [FakeCoordinator(f"meter {k}") for k in range(4)]
+    for coordinator in coordinators:
+        fleet.async_schedule(coordinator)
+    # Rescheduled after their next poll, on the grid of the final fleet
+    for coordinator in coordinators:
+        fleet.async_schedule(coordinator)
+    assert _phases(fleet, coordinators) == [0.0, 2.5, 5.0, 7.5]
+
+    fleet.async_remove(coordinators[1])
+    remaining = [coordinators[0], coordinators[2], coordinators[3]]
+    for coordinator in remaining:
+        fleet.async_schedule(coordinator)
+    assert coordinators[1] not in fleet._due
+    assert _phases(fleet, remaining) == pytest.approx([0.0, 10 / 3, 20 / 3])
+    _leave(fleet, remaining)
+
+
+def test_next_poll_is_at_least_half_an_interval_away(fleet: FleetPoller) -> None:
+    """Whenever it is scheduled, a poll comes within half to one and a half intervals."""
+    coordinators = [FakeCoordinator(f"meter {k}") for k in range(3)]
+    fleet._members.extend(coordinators)
+    for step in range(100):
+        now = fleet._epoch + step * 0.37
+        for coordinator in coordinators:
+            delay = fleet._next_due(coordinator, now) - now
+            assert INTERVAL / 2 <= delay < 1.5 * INTERVAL
+
+
+def test_steady_polls_keep_the_interval(fleet: FleetPoller) -> None:
+    """A poll completing within half an interval is followed one interval after it was due."""
+    coordinator = FakeCoordinator("meter")
+    fleet._members.append(coordinator)
+    due = fleet._next_due(coordinator, fleet._epoch)
+    for _ in range(5):
+        following = fleet._next_due(coordinator, due + 0.4 * INTERVAL)
+        assert following == pytest.approx(due + INTERVAL)
+        due = following
+
+
+async def test_concurrent_polls_are_bounded(hass: HomeAssistant, fleet: FleetPoller) -> None:
+    """No more polls than the semaphore allows run at once."""
+    coordinators = [FakeCoordinator(f"meter {k}") for k in range(5)]
+    for coordinator in coordinators:
+        coordinator.release.clear()
+        fleet._members.append(coordinator)
+        fleet._due[coordinator] = 0.0
+    fleet._async_run_due()
+    await asyncio.sleep(0)
+    assert fleet.stats["running"] == 2
+
+    for coordinator in coordinators:
+        coordinator.release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert fleet.stats["max_running"] == 2
+    assert fleet.stats["polls"] == 5
+    assert all(coordinator.refreshes == 1 for coordinator in coordinators)
+
+
+async def test_poll_rescheduled_while_waiting_is_skipped(hass: HomeAssistant) -> None:
+    """A coordinator refreshed while its poll waits for a slot is not polled twice."""
+    fleet = FleetPoller(hass, max_concurrent=1)
+    first, second = FakeCoordinator("first"), FakeCoordinator("second")
+    first.release.clear()
+    for coordinator in (first, second):
+        fleet._members.append(coordinator)
+        fleet._due[coordinator] = 0.0
+    fleet._async_run_due()
+    await asyncio.sleep(0)
+
+    # Refreshed by a pushed update: its next poll is scheduled again
+    fleet.async_schedule(second)
+    first.release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert (first.refreshes, second.refreshes) == (1, 0)
+    assert fleet.stats["skipped"] == 1
+    assert second in fleet._due
+    _leave(fleet, [first, second])
+
+
+async def test_coordinator_is_polled_by_the_fleet(hass: HomeAssistant, device: FakeDevice) -> None:
+    """With a fleet, the coordinator keeps no timer of its own and leaves the fleet on shutdown."""
+    fleet = FleetPoller(hass)
+    coordinator = EnergyMeMeterCoordinator(hass, mock_entry(hass), device, fleet)
+    # Polls are only scheduled while an entity listens
+    coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    assert coordinator in fleet._due
+    assert coordinator._unsub_refresh is None
+
+    await coordinator.async_shutdown()
+    assert coordinator not in fleet._due
+    assert coordinator not in fleet._members
+    assert fleet._timer is None
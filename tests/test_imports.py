@@ -0,0 +1,14 @@
+"""Tests of the modules imported before an entry is set up."""
+
+import pytest
+
+import benchmark_import
+
+
+def test_setup_modules_are_deferred() -> None:
+    """Loading the integration does not import what only an entry runs on."""
+    # The prelude includes the helpers of the Home Assistant release the config flow targets
+    pytest.importorskip("homeassistant.helpers.service_info.zeroconf")
+    _, modules = benchmark_import.measure("preload")
+    assert modules
+    assert not benchmark_import.DEFERRED_MODULES.intersection(modules)
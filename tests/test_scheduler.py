@@ -0,0 +1,92 @@
+"""Tests of the request scheduler of a device."""
+
+import asyncio
+
+import pytest
+
+from custom_components.energyme.api import RequestPriority, RequestScheduler
+
+
+async def _hold_slot(
+    scheduler: RequestScheduler,
+    priority: RequestPriority,
+    name: str,
+    order: list[str],
+    release: asyncio.Event,
+) -> None:
+    """Take a slot, note it and keep it until released."""
+    async with scheduler.async_slot(priority):
+        order.append(name)
+        await release.wait()
+
+
+async def test_waiters_are_served_by_priority_then_arrival() -> None:
+    """Meter requests overtake queued config and system requests."""
+    scheduler = RequestScheduler(max_in_flight=1)
+    order: list[str] = []
+    release = asyncio.Event()
+    release.set()
+
+    async with scheduler.async_slot(RequestPriority.SYSTEM):
+        tasks = [
+            asyncio.create_task(_hold_slot(scheduler, priority, name, order, release))
+            for priority, name in (
+                (RequestPriority.SYSTEM, "system"),
+                (RequestPriority.CONFIG, "config"),
+                (RequestPriority.METER, "meter 1"),
+                (RequestPriority.METER, "meter 2"),
+            )
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 4
+
+    await asyncio.gather(*tasks)
+    assert order == ["meter 1", "meter 2", "config", "system"]
+    assert scheduler.stats["in_flight"] == 0
+    assert scheduler.stats["max_queue_depth"] == 4
+
+
+async def test_in_flight_requests_are_bounded() -> None:
+    """No more than max_in_flight slots are taken at once."""
+    scheduler = RequestScheduler(max_in_flight=2)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(
+            _hold_slot(scheduler, RequestPriority.METER, str(index), order, release)
+        )
+        for index in range(5)
+    ]
+    await asyncio.sleep(0)
+    assert order == ["0", "1"]
+    assert scheduler.stats["in_flight"] == 2
+    assert scheduler.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["0", "1", "2", "3", "4"]
+    assert scheduler.stats["in_flight"] == 0
+    assert scheduler.queue_depth == 0
+
+
+async def test_waiter_cancelled_after_handover_frees_the_slot() -> None:
+    """A slot handed to a waiter cancelled before it resumes is not leaked."""
+    scheduler = RequestScheduler(max_in_flight=1)
+    slot = scheduler.async_slot(RequestPriority.METER)
+    await slot.__aenter__()
+
+    waiter = asyncio.create_task(_hold_slot(scheduler, RequestPriority.METER, "waiter", [], asyncio.Event()))
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth == 1
+
+    # Hands the slot over to the waiter, which is cancelled before it resumes
+    await slot.__aexit__(None, None, None)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.stats["in_flight"] == 0
+    assert scheduler.queue_depth == 0
+    async with asyncio.timeout(1), scheduler.async_slot(RequestPriority.METER):
+        assert scheduler.stats["in_flight"] == 1
@@ -0,0 +1,83 @@
+"""Tests of the state write suppression of the meter sensors."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.energyme.const import DOMAIN
+from custom_components.energyme.coordinator import (
+    EnergyMeMeterCoordinator,
+    EnergyMeSystemCoordinator,
+)
+from custom_components.energyme.sensor import SENSOR_DESCRIPTIONS, EnergyMeSensor
+
+NAME = "Channel 0 - Active Power"
+
+
+@pytest.fixture
+def power_sensor(
+    hass: HomeAssistant,
+    meter_coordinator: EnergyMeMeterCoordinator,
+    system_coordinator: EnergyMeSystemCoordinator,
+) -> EnergyMeSensor:
+    """Return the active power sensor of channel 0, last written as 100 W at t=0."""
+    entry = meter_coordinator.config_entry
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            "meter_coordinator": meter_coordinator,
+            "system_coordinator": system_coordinator,
+            "config_entry": entry,
+        }
+    }
+    sensor = EnergyMeSensor(
+        meter_coordinator,
+        entry.entry_id,
+        0,
+        "Channel 0",
+        "activePower",
+        SENSOR_DESCRIPTIONS["activePower"],
+    )
+    assert sensor._should_write_state((100.0, True, NAME), 0.0)
+    sensor._written_state = (100.0, True, NAME)
+    sensor._written_at = 0.0
+    return sensor
+
+
+def test_unchanged_state_is_not_written(power_sensor: EnergyMeSensor) -> None:
+    """With the default options, only a change is written."""
+    assert not power_sensor._should_write_state((100.0, True, NAME), 3600.0)
+    assert power_sensor._should_write_state((100.1, True, NAME), 0.1)
+
+
+def test_max_age_rewrites_an_unchanged_state(power_sensor: EnergyMeSensor) -> None:
+    """An unchanged state is rewritten once it reaches the max age."""
+    power_sensor.coordinator.state_max_age = 60.0
+    assert not power_sensor._should_write_state((100.0, True, NAME), 59.0)
+    assert power_sensor._should_write_state((100.0, True, NAME), 60.0)
+
+
+def test_deadband(power_sensor: EnergyMeSensor) -> None:
+    """Changes up to the deadband of the metric are not written."""
+    power_sensor.coordinator.deadbands = {"activePower": 5.0}
+    assert not power_sensor._should_write_state((105.0, True, NAME), 10.0)
+    assert not power_sensor._should_write_state((95.0, True, NAME), 10.0)
+    assert power_sensor._should_write_state((105.1, True, NAME), 10.0)
+    assert power_sensor._should_write_state((None, True, NAME), 10.0)
+
+
+def test_min_write_interval(power_sensor: EnergyMeSensor) -> None:
+    """A value change waits for the minimum interval, availability and name do not."""
+    power_sensor.coordinator.min_write_interval = 30.0
+    assert not power_sensor._should_write_state((500.0, True, NAME), 29.0)
+    assert power_sensor._should_write_state((500.0, True, NAME), 30.0)
+    assert power_sensor._should_write_state((None, False, NAME), 1.0)
+    assert power_sensor._should_write_state((100.0, True, "Heat pump - Active Power"), 1.0)
+
+
+def test_max_age_overrides_the_deadband(power_sensor: EnergyMeSensor) -> None:
+    """A change within the deadband is still written when the state gets old."""
+    coordinator = power_sensor.coordinator
+    coordinator.deadbands = {"activePower": 5.0}
+    coordinator.min_write_interval = 30.0
+    coordinator.state_max_age = 300.0
+    assert not power_sensor._should_write_state((101.0, True, NAME), 299.0)
+    assert power_sensor._should_write_state((101.0, True, NAME), 300.0)
@@ -0,0 +1,61 @@
+"""Tests of the server-sent meter values stream parser."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from custom_components.energyme.api import EnergyMeClient
+
+
+class FakeStreamResponse:
+    """Serve the lines of a server-sent events stream."""
+
+    def __init__(self, lines: list[bytes]) -> None:
+        """Initialize the response with its raw lines."""
+        self._lines = lines
+
+    @property
+    def content(self) -> AsyncIterator[bytes]:
+        """Return the body, read line by line."""
+        return self._iter_lines()
+
+    async def _iter_lines(self) -> AsyncIterator[bytes]:
+        for line in self._lines:
+            yield line
+
+
+async def _read(lines: list[bytes], on_meter_values: Any) -> None:
+    client = EnergyMeClient(None, "192.0.2.1", "admin", "energyme")
+    await client._async_read_events(FakeStreamResponse(lines), on_meter_values)
+
+
+async def test_events_are_decoded() -> None:
+    """Multi-line data is joined, heartbeats and event names are ignored."""
+    payloads: list[Any] = []
+    await _read(
+        [b": heartbeat\n", b"event: meter\n", b'data: [{"index": 0,\n', b'data: "power": 1.5}]\n', b"\n"],
+        payloads.append,
+    )
+    assert payloads == [[{"index": 0, "power": 1.5}]]
+
+
+async def test_invalid_bytes_are_replaced() -> None:
+    """Invalid UTF-8 neither ends the stream nor drops the following events."""
+    payloads: list[Any] = []
+    await _read(
+        [b'data: {"label": "L\xff"}\n', b"\n", b"data: [\xff\n", b"\n", b"data: [1]\n", b"\n"],
+        payloads.append,
+    )
+    assert payloads == [{"label": "L\ufffd"}, [1]]
+
+
+async def test_failing_handler_does_not_end_the_stream() -> None:
+    """An event the handler fails on is logged, the following ones are handled."""
+    payloads: list[Any] = []
+
+    def on_meter_values(payload: Any) -> None:
+        if payload == "bad":
+            raise KeyError("index")
+        payloads.append(payload)
+
+    await _read([b'data: "bad"\n', b"\n", b'data: "good"\n', b"\n"], on_meter_values)
+    assert payloads == ["good"]